@@ -0,0 +1,56 @@
+"""Vectorized validation of many boards at once, for replaying submission logs.
+
+Boards are given as a (k, n) integer array, one row per board holding the
+column of the queen in each row.
+"""
+import numpy as np
+from utils import bits_per_row
+
+DEFAULT_CHUNK = 65536  # boards per bincount pass; bounds the temporary count arrays
+
+
+def _line_pairs(lines, width):
+    """Pairs of queens sharing a line, per board. lines holds line ids in [0, width)."""
+    k = lines.shape[0]
+    flat = (lines + (np.arange(k, dtype=np.int64) * width)[:, None]).ravel()
+    counts = np.bincount(flat, minlength=k * width).reshape(k, width)
+    return (counts * (counts - 1) // 2).sum(axis=1)
+
+
+def validate_boards(boards, chunk_size=DEFAULT_CHUNK):
+    """Check every board for column and diagonal conflicts.
+
+    Returns (valid, conflicts): a bool array and the number of attacking
+    queen pairs per board. Boards with a column outside 0..n-1 are invalid;
+    their conflicts are counted with those columns clipped to the board.
+    """
+    boards = np.asarray(boards, dtype=np.int64)
+    if boards.ndim != 2:
+        raise ValueError("boards must be a (k, n) array")
+    k, n = boards.shape
+    valid = np.empty(k, dtype=bool)
+    conflicts = np.empty(k, dtype=np.int64)
+    rows = np.arange(n, dtype=np.int64)
+    for start in range(0, k, chunk_size):
+        chunk = boards[start:start + chunk_size]
+        in_range = ((chunk >= 0) & (chunk < n)).all(axis=1)
+        cols = np.clip(chunk, 0, max(n - 1, 0))
+        pairs = (_line_pairs(cols, n)
+                 + _line_pairs(rows - cols + n - 1, 2 * n - 1)
+                 + _line_pairs(rows + cols, 2 * n - 1))
+        conflicts[start:start + len(chunk)] = pairs
+        valid[start:start + len(chunk)] = in_range & (pairs == 0)
+    return valid, conflicts
+
+
+def encode_boards(boards):
+    """Vectorized utils.encode_board for boards whose codes fit in 63 bits (n <= 15)."""
+    boards = np.asarray(boards, dtype=np.int64)
+    n = boards.shape[1]
+    bits = bits_per_row(n)
+    if n * bits > 63:
+        raise ValueError(f"codes for n={n} do not fit in a 64-bit integer")
+    if ((boards < 0) | (boards >= n)).any():
+        raise ValueError(f"boards hold columns outside 0..{n - 1}")
+    shifts = np.arange(n, dtype=np.int64) * bits
+    return (boards << shifts).sum(axis=1)
@@ -0,0 +1,203 @@
+"""Headless solver benchmark.
+
+Runs every solver engine over a range of board sizes with warmup and
+repetitions, timing compute and persistence separately, and optionally
+compares the medians against a stored baseline:
+
+    python benchmark.py --sizes 6-10 --repeat 5 --output bench.json
+    python benchmark.py --baseline bench.json --threshold 0.10
+
+With --stats, one extra instrumented run per engine and size adds the
+search counters (nodes, prunes, per-depth branching) to the report.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import database
+from solver import (
+    solve_bitboard, solve_threaded, solve_parallel, solve_symmetric, count_solutions
+)
+from instrumentation import SearchStats
+from utils import percentile
+
+# Compute-only entry points: none of them write to the database
+ENGINES = {
+    "sequential": lambda n, stats=None: solve_bitboard(n, stats=stats),
+    "threaded": lambda n, stats=None: solve_threaded(n, persist=False, stats=stats),
+    "parallel": lambda n, stats=None: solve_parallel(n, persist=False, stats=stats),
+    "symmetric": lambda n, stats=None: solve_symmetric(n, persist=False, stats=stats),
+    "count": lambda n, stats=None: count_solutions(n, persist=False, stats=stats),
+    "count_symmetric": lambda n, stats=None: count_solutions(n, symmetric=True, persist=False,
+                                                             stats=stats),
+}
+
+
+def summarize(samples_ns):
+    """Summary statistics of nanosecond samples, reported in milliseconds."""
+    samples = [ns / 1e6 for ns in samples_ns]
+    return {
+        "runs": len(samples),
+        "median_ms": statistics.median(samples),
+        "p95_ms": percentile(samples, 95),
+        "stdev_ms": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "min_ms": min(samples),
+    }
+
+
+def time_call(func, *args, warmup=1, repeat=5):
+    """Run func warmup times untimed, then repeat times with perf_counter_ns.
+
+    Returns (samples_ns, last_result).
+    """
+    result = None
+    for _ in range(warmup):
+        result = func(*args)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        result = func(*args)
+        samples.append(time.perf_counter_ns() - start)
+    return samples, result
+
+
+def time_persistence(solutions, warmup=1, repeat=5):
+    """Time save_solutions for one solution set against a scratch database."""
+    def save():
+        conn = database.get_connection()
+        with conn:
+            conn.execute("DELETE FROM solutions")
+        start = time.perf_counter_ns()
+        database.save_solutions(solutions)
+        return time.perf_counter_ns() - start
+
+    for _ in range(warmup):
+        save()
+    return [save() for _ in range(repeat)]
+
+
+def run_benchmarks(engines=None, sizes=range(4, 11), warmup=1, repeat=5, persist=True,
+                   instrument=False):
+    """Benchmark each engine for each board size. Returns a JSON-serializable dict."""
+    engines = list(engines or ENGINES)
+    report = {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "warmup": warmup,
+            "repeat": repeat,
+        },
+        "results": [],
+    }
+
+    saved_db = database.DB_NAME
+    with tempfile.TemporaryDirectory() as scratch:
+        database.DB_NAME = os.path.join(scratch, "benchmark.db")
+        try:
+            if persist:
+                database.init_db()
+            for name in engines:
+                for n in sizes:
+                    samples, result = time_call(ENGINES[name], n, warmup=warmup, repeat=repeat)
+                    entry = {
+                        "engine": name,
+                        "n": n,
+                        "solutions": result if isinstance(result, int) else len(result),
+                        "compute": summarize(samples),
+                        "persist": None,
+                        "search": None,
+                    }
+                    if persist and not isinstance(result, int):
+                        entry["persist"] = summarize(time_persistence(result, warmup, repeat))
+                    if instrument:
+                        stats = SearchStats(n)
+                        ENGINES[name](n, stats)
+                        entry["search"] = stats.as_dict()
+                    report["results"].append(entry)
+        finally:
+            database.close_connections()
+            database.DB_NAME = saved_db
+    return report
+
+
+def compare_to_baseline(report, baseline, threshold=0.10):
+    """List the (engine, n) compute medians that are slower than baseline by more than threshold."""
+    previous = {(r["engine"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for result in report["results"]:
+        base = previous.get((result["engine"], result["n"]))
+        if base is None:
+            continue
+        before = base["compute"]["median_ms"]
+        after = result["compute"]["median_ms"]
+        if before > 0 and after > before * (1 + threshold):
+            regressions.append({
+                "engine": result["engine"],
+                "n": result["n"],
+                "baseline_ms": before,
+                "current_ms": after,
+                "ratio": after / before,
+            })
+    return regressions
+
+
+def parse_sizes(text):
+    """Parse "8", "6-10" or "6,8,10" into a list of board sizes."""
+    sizes = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            sizes.extend(range(int(low), int(high) + 1))
+        else:
+            sizes.append(int(part))
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help="comma-separated engines: " + ", ".join(ENGINES))
+    parser.add_argument("--sizes", default="4-10", help='board sizes, e.g. "8" or "6-10"')
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-persist", action="store_true", help="skip persistence timing")
+    parser.add_argument("--stats", action="store_true", help="add search counters to the report")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown versus the baseline median (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    engines = [name.strip() for name in args.engines.split(",") if name.strip()]
+    unknown = [name for name in engines if name not in ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+
+    report = run_benchmarks(engines, parse_sizes(args.sizes), args.warmup, args.repeat,
+                            persist=not args.no_persist, instrument=args.stats)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(report, json.load(f), args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['engine']} n={r['n']}: {r['baseline_ms']:.3f} ms -> "
+                  f"{r['current_ms']:.3f} ms ({r['ratio']:.2f}x)", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
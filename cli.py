@@ -0,0 +1,327 @@
+"""Headless command line for solving, exporting and loading solution sets.
+
+    python cli.py solve --engine parallel --sizes 8-12 --workers 4 --db solutions.db
+    python cli.py solve --sizes 4-14 --count-only
+    python cli.py solve --engine sequential --sizes 10 --binary - > n10.bin
+    python cli.py export --db solutions.db --sizes 8 --csv n8.csv
+    python cli.py load --db other.db --binary n10.bin
+    python cli.py shards plan --n 17 --depth 3 --db job.db
+    python cli.py shards work --n 17 --workers 8 --db job.db
+    python cli.py shards merge --n 17 --db job.db
+
+Solutions go to SQLite (--db), CSV (--csv, one "n,board" row per solution)
+or a binary stream (--binary) of frames: a header holding FRAME_MAGIC, n
+and the record count, then that many fixed-width big-endian encode_board
+codes of code_width(n) bytes. "-" means stdout/stdin for CSV and binary.
+Throughput is reported on stderr, one line per board size. load skips
+rows that are not valid solutions, reports them and exits with status 1.
+A closed stdout (e.g. piping into head) ends the command quietly. The
+"cached" engine reads the solution cache, solving only the sizes not
+cached yet.
+The shards command drives a checkpointed counting job (see shards.py); an
+interrupted "work" resumes where it stopped.
+"""
+import argparse
+import csv
+import os
+import struct
+import sys
+import time
+from itertools import groupby, islice
+import database
+from solver import (
+    iter_solutions, solve_threaded, solve_parallel, solve_symmetric, count_solutions
+)
+from benchmark import parse_sizes
+from solution_cache import get_solutions
+from shards import plan_shards, run_worker, run_workers, shard_progress, merge_shards, STALE_AFTER
+from utils import code_width, encode_board, decode_board, parse_board
+
+FRAME_MAGIC = b"NQB1"
+FRAME = struct.Struct(">4sHI")  # magic, n, number of records
+CHUNK_SIZE = 4096  # solutions per database transaction and binary frame
+
+# Enumerating engines return an iterable of boards; counting engines an int
+ENUMERATE = {
+    "sequential": lambda n, workers: iter_solutions(n),
+    "threaded": lambda n, workers: solve_threaded(n, persist=False),
+    "parallel": lambda n, workers: solve_parallel(n, workers=workers, persist=False),
+    "symmetric": lambda n, workers: solve_symmetric(n, persist=False),
+    "cached": lambda n, workers: get_solutions(n),
+}
+COUNT = {
+    "sequential": lambda n, workers: count_solutions(n, persist=False),
+    "threaded": lambda n, workers: len(solve_threaded(n, persist=False)),
+    "parallel": lambda n, workers: count_solutions(n, parallel=True, workers=workers, persist=False),
+    "symmetric": lambda n, workers: count_solutions(n, parallel=workers is not None, symmetric=True,
+                                                    workers=workers, persist=False),
+    "cached": lambda n, workers: len(get_solutions(n)),
+}
+
+
+def write_frame(f, n, boards):
+    """Write one binary frame holding boards, all of size n."""
+    width = code_width(n)
+    f.write(FRAME.pack(FRAME_MAGIC, n, len(boards)))
+    f.write(b"".join(encode_board(board).to_bytes(width, "big") for board in boards))
+
+def read_frames(f):
+    """Yield (n, boards) for each frame of a binary stream until end of file."""
+    while True:
+        header = f.read(FRAME.size)
+        if not header:
+            return
+        if len(header) < FRAME.size:
+            raise ValueError("Truncated frame header")
+        magic, n, count = FRAME.unpack(header)
+        if magic != FRAME_MAGIC:
+            raise ValueError(f"Bad frame magic {magic!r}")
+        width = code_width(n)
+        data = f.read(width * count)
+        if len(data) < width * count:
+            raise ValueError(f"Truncated frame for n={n}")
+        yield n, [decode_board(int.from_bytes(data[i:i + width], "big"), n)
+                  for i in range(0, len(data), width)]
+
+
+class _Sink:
+    """Destination for solution chunks: a SQLite database, a CSV file or a binary stream."""
+
+    def __init__(self, db=None, csv_path=None, binary_path=None):
+        self.db = db
+        self._file = None
+        self._csv = None
+        self._binary = None
+        if csv_path is not None:
+            self._file = sys.stdout if csv_path == "-" else open(csv_path, "w", newline="")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(["n", "board"])
+        elif binary_path is not None:
+            self._file = sys.stdout.buffer if binary_path == "-" else open(binary_path, "wb")
+            self._binary = self._file
+
+    def write(self, n, boards):
+        if self.db is not None:
+            database.save_solutions(boards, chunk_size=CHUNK_SIZE)
+        elif self._csv is not None:
+            self._csv.writerows((n, ",".join(map(str, board))) for board in boards)
+        elif self._binary is not None:
+            write_frame(self._binary, n, boards)
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._file in (sys.stdout, sys.stdout.buffer):
+            self._file.flush()
+        else:
+            self._file.close()
+
+
+def _chunks(iterable, size=CHUNK_SIZE):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _report(action, n, count, elapsed, engine=None):
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    engine = f" engine={engine}" if engine else ""
+    print(f"{action} n={n}{engine} solutions={count} time={elapsed:.3f}s rate={rate:,.0f}/s",
+          file=sys.stderr)
+
+
+def solve(args, sink):
+    for n in parse_sizes(args.sizes):
+        start = time.perf_counter()
+        if args.count_only:
+            count = COUNT[args.engine](n, args.workers)
+        else:
+            count = 0
+            for chunk in _chunks(ENUMERATE[args.engine](n, args.workers)):
+                sink.write(n, chunk)
+                count += len(chunk)
+        elapsed = time.perf_counter() - start
+        _report("solve", n, count, elapsed, args.engine)
+        if args.db is not None:
+            database.record_time(f"cli-{args.engine}", elapsed, n=n, solutions=count,
+                                 options={"workers": args.workers, "count_only": args.count_only})
+
+def export(args, sink):
+    sizes = parse_sizes(args.sizes) if args.sizes else [None]
+    current = None
+    count = 0
+    start = time.perf_counter()
+    for size in sizes:
+        cursor = None
+        while True:
+            page, cursor = database.get_solutions_page(after=cursor, limit=CHUNK_SIZE, n=size)
+            for n, group in groupby((board for board, _, _ in page), key=len):
+                if n != current:
+                    if current is not None:
+                        _report("export", current, count, time.perf_counter() - start)
+                    current, count, start = n, 0, time.perf_counter()
+                boards = list(group)
+                sink.write(n, boards)
+                count += len(boards)
+            if cursor is None:
+                break
+    if current is not None:
+        _report("export", current, count, time.perf_counter() - start)
+
+def _split_valid(boards):
+    """Split boards into (solutions, rejected), checking each board size in one vectorized pass."""
+    from batch_validator import validate_boards  # numpy is only needed when loading
+    solutions, rejected = [], []
+    for _, group in groupby(sorted(boards, key=len), key=len):
+        group = list(group)
+        valid, _ = validate_boards(group)
+        for board, ok in zip(group, valid):
+            (solutions if ok else rejected).append(board)
+    return solutions, rejected
+
+def _csv_boards(rows, rejected):
+    for row in rows:
+        try:
+            board = parse_board(row[1])
+            if int(row[0]) == len(board):
+                yield board
+                continue
+        except (ValueError, IndexError):
+            pass
+        rejected.append(",".join(row))
+
+def load(args):
+    """Load CSV or binary solutions into the database, skipping anything that is not a solution.
+
+    Rejected rows are reported on stderr. Returns the exit code: 1 if any row was rejected.
+    """
+    start = time.perf_counter()
+    total = inserted = 0
+    rejected = []
+
+    def store(boards):
+        nonlocal total, inserted
+        solutions, bad = _split_valid(boards)
+        rejected.extend(bad)
+        inserted += database.save_solutions(solutions, chunk_size=CHUNK_SIZE)
+        total += len(solutions)
+
+    if args.csv is not None:
+        f = sys.stdin if args.csv == "-" else open(args.csv, newline="")
+        with f:
+            rows = csv.reader(f)
+            next(rows, None)  # Header
+            for chunk in _chunks(_csv_boards(rows, rejected)):
+                store(chunk)
+    else:
+        f = sys.stdin.buffer if args.binary == "-" else open(args.binary, "rb")
+        with f:
+            for _, boards in read_frames(f):
+                store(boards)
+    _report("load", "*", total, time.perf_counter() - start)
+    print(f"loaded {total} solutions, {inserted} new, {len(rejected)} rejected", file=sys.stderr)
+    for board in rejected[:10]:
+        print(f"rejected {board}", file=sys.stderr)
+    return 1 if rejected else 0
+
+def shards(args):
+    """Plan, work on, inspect or merge the sharded counting job for args.n. Returns the exit code."""
+    if args.action == "plan":
+        print(f"planned {plan_shards(args.n, args.depth)} shards for n={args.n}", file=sys.stderr)
+    elif args.action == "work":
+        start = time.perf_counter()
+        if args.workers and args.workers > 1:
+            ran = run_workers(args.n, args.workers, args.stale_after)
+        else:
+            ran = run_worker(args.n, stale_after=args.stale_after)
+        elapsed = time.perf_counter() - start
+        print(f"work n={args.n} shards={ran} time={elapsed:.3f}s", file=sys.stderr)
+    elif args.action == "status":
+        progress = shard_progress(args.n)
+        print(" ".join(f"{status}={count}" for status, count in sorted(progress.items())) or "no shards")
+    else:
+        try:
+            print(merge_shards(args.n, args.recheck))
+        except ValueError as e:
+            print(f"merge failed: {e}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def _add_outputs(parser, required):
+    group = parser.add_mutually_exclusive_group(required=required)
+    group.add_argument("--csv", metavar="PATH", help='CSV file ("-" for stdout)')
+    group.add_argument("--binary", metavar="PATH", help='binary frame stream ("-" for stdout)')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solve_parser = commands.add_parser("solve", help="solve a range of board sizes")
+    solve_parser.add_argument("--engine", choices=list(ENUMERATE), default="sequential")
+    solve_parser.add_argument("--sizes", default="8", help='board sizes, e.g. "8" or "6-10"')
+    solve_parser.add_argument("--workers", type=int, help="process pool size for parallel engines")
+    solve_parser.add_argument("--count-only", action="store_true",
+                              help="count solutions without enumerating them")
+    solve_parser.add_argument("--db", metavar="PATH", help="SQLite database to store solutions in")
+    _add_outputs(solve_parser, required=False)
+
+    export_parser = commands.add_parser("export", help="export stored solutions")
+    export_parser.add_argument("--db", metavar="PATH", default=database.DB_NAME)
+    export_parser.add_argument("--sizes", help="only these board sizes (default: all)")
+    _add_outputs(export_parser, required=True)
+
+    load_parser = commands.add_parser("load", help="load exported solutions into a database")
+    load_parser.add_argument("--db", metavar="PATH", default=database.DB_NAME)
+    _add_outputs(load_parser, required=True)
+
+    shards_parser = commands.add_parser("shards", help="run a checkpointed, sharded counting job")
+    shards_parser.add_argument("action", choices=["plan", "work", "status", "merge"])
+    shards_parser.add_argument("--n", type=int, required=True, help="board size")
+    shards_parser.add_argument("--db", metavar="PATH", default=database.DB_NAME,
+                               help="database holding the job, shared by every worker")
+    shards_parser.add_argument("--depth", type=int, default=2, help="prefix rows per shard (plan)")
+    shards_parser.add_argument("--workers", type=int, help="worker processes (work)")
+    shards_parser.add_argument("--stale-after", type=float, default=STALE_AFTER,
+                               help="seconds without a heartbeat before a claimed shard is handed out again (work)")
+    shards_parser.add_argument("--recheck", type=int, default=0,
+                               help="shards to recount while verifying (merge)")
+
+    args = parser.parse_args(argv)
+    if args.command == "solve":
+        outputs = [arg for arg in (args.db, args.csv, args.binary) if arg is not None]
+        if len(outputs) > 1:
+            parser.error("choose one of --db, --csv and --binary")
+        if args.count_only and (args.csv or args.binary):
+            parser.error("--count-only has no solutions to write to --csv or --binary")
+
+    saved_db = database.DB_NAME
+    sink = None
+    try:
+        if args.db is not None:
+            database.DB_NAME = args.db
+            database.init_db()
+        if args.command == "shards":
+            return shards(args)
+        if args.command == "load":
+            return load(args)
+        else:
+            sink = _Sink(args.db if args.command == "solve" else None, args.csv, args.binary)
+            (solve if args.command == "solve" else export)(args, sink)
+    except BrokenPipeError:
+        # The reader went away (e.g. "| head"); point stdout at devnull so the final flush is quiet
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+    finally:
+        if sink is not None:
+            sink.close()
+        database.close_connections()
+        database.DB_NAME = saved_db
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
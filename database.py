@@ -1,113 +1,595 @@
 import sqlite3
 import os
+import json
+import time
 import logging
+import platform
+import threading
+from itertools import islice
+from utils import bits_per_row, encode_board, decode_board, parse_board, percentile
 
-# Set up logging
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
 DB_NAME = "eight_queens.db"
 
+# One connection per (process, thread, database file), reused across calls.
+_connections = {}
+_connections_lock = threading.Lock()
+
+def get_connection():
+    """Return the calling thread's cached connection to DB_NAME, opening it on first use.
+
+    Connections run in WAL mode so readers never block the writer, and keep
+    sqlite3's prepared-statement cache warm between calls.
+    """
+    key = (os.getpid(), threading.get_ident(), DB_NAME)
+    conn = _connections.get(key)
+    if conn is None:
+        conn = sqlite3.connect(DB_NAME, timeout=30, check_same_thread=False,
+                               cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _connections_lock:
+            _connections[key] = conn
+    return conn
+
+def close_connection():
+    """Close the calling thread's cached connection to DB_NAME, if it has one."""
+    with _connections_lock:
+        conn = _connections.pop((os.getpid(), threading.get_ident(), DB_NAME), None)
+    if conn is not None:
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing connection: {e}")
+
+def close_connections():
+    """Close every cached connection opened by this process."""
+    pid = os.getpid()
+    with _connections_lock:
+        for key in [key for key in _connections if key[0] == pid]:
+            conn = _connections.pop(key)
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error closing connection: {e}")
+
+def _to_key(solution):
+    """Map a board (sequence of columns, or legacy text) to its (n, code) primary key.
+
+    Codes wider than 63 bits do not fit SQLite's INTEGER and are stored as
+    fixed-width big-endian BLOBs instead.
+    """
+    if isinstance(solution, str):
+        solution = parse_board(solution)
+    n = len(solution)
+    return n, _stored_code(n, encode_board(solution))
+
+def _stored_code(n, code):
+    """The form an encode_board code of size n is stored in: an int, or a BLOB past 63 bits."""
+    width = n * bits_per_row(n)
+    if width > 63:
+        return code.to_bytes((width + 7) // 8, "big")
+    return code
+
+def _from_key(n, code):
+    if isinstance(code, bytes):
+        code = int.from_bytes(code, "big")
+    return decode_board(code, n)
+
+def _migrate_text_solutions(c, round_id):
+    """Move rows from the old TEXT-keyed solutions table into the (n, code) schema.
+
+    Recognized rows become recognitions of round round_id.
+    """
+    logger.debug("Migrating TEXT solutions to packed integer keys")
+    c.execute("ALTER TABLE solutions RENAME TO solutions_legacy")
+    _create_solutions_table(c)
+    # Recognized rows first, so a board stored under two text formats keeps its recognition
+    c.execute("SELECT solution, recognized_by, recognized FROM solutions_legacy "
+              "ORDER BY recognized DESC")
+    rows = []
+    recognitions = []
+    for solution, recognized_by, recognized in c.fetchall():
+        try:
+            n, code = _to_key(solution)
+        except (ValueError, AttributeError):
+            logger.warning(f"Dropping unparsable or off-board solution during migration: {solution!r}")
+            continue
+        rows.append((n, code))
+        if recognized:
+            recognitions.append((round_id, n, code, recognized_by))
+    c.executemany("INSERT OR IGNORE INTO solutions (n, code) VALUES (?, ?)", rows)
+    c.executemany("INSERT OR IGNORE INTO recognitions (round, n, code, recognized_by) "
+                  "VALUES (?, ?, ?, ?)", recognitions)
+    c.execute("DROP TABLE solutions_legacy")
+
+def _migrate_recognized_flags(c, round_id):
+    """Move the per-row recognized flags of the solutions table into recognitions of round_id."""
+    logger.debug("Migrating recognized flags to round recognitions")
+    c.execute("ALTER TABLE solutions RENAME TO solutions_flags")
+    _create_solutions_table(c)
+    c.execute("INSERT INTO solutions (n, code) SELECT n, code FROM solutions_flags")
+    c.execute("INSERT INTO recognitions (round, n, code, recognized_by) "
+              "SELECT ?, n, code, recognized_by FROM solutions_flags WHERE recognized = 1", (round_id,))
+    c.execute("DROP TABLE solutions_flags")
+
+def _create_solutions_table(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS solutions (
+            n INTEGER NOT NULL,
+            code INTEGER NOT NULL,
+            PRIMARY KEY (n, code)
+        ) WITHOUT ROWID
+    ''')
+
+def _create_round_tables(c):
+    """Rounds of the game, who recognized what in each round, and per-round progress counters."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS rounds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at REAL NOT NULL,
+            ended_at REAL
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS recognitions (
+            round INTEGER NOT NULL,
+            n INTEGER NOT NULL,
+            code INTEGER NOT NULL,
+            recognized_by TEXT,
+            recognized_at REAL,
+            PRIMARY KEY (round, n, code)
+        ) WITHOUT ROWID
+    ''')
+    # found/total per round and board size, kept current by the triggers below
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS round_progress (
+            round INTEGER NOT NULL,
+            n INTEGER NOT NULL,
+            found INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (round, n)
+        ) WITHOUT ROWID
+    ''')
+
+def _create_progress_triggers(c):
+    current = "(SELECT MAX(id) FROM rounds)"
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS solutions_counted AFTER INSERT ON solutions BEGIN
+            INSERT INTO round_progress (round, n, total) VALUES ({current}, NEW.n, 1)
+                ON CONFLICT (round, n) DO UPDATE SET total = total + 1;
+        END
+    ''')
+    c.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS solutions_uncounted AFTER DELETE ON solutions BEGIN
+            DELETE FROM recognitions WHERE round = {current} AND n = OLD.n AND code = OLD.code;
+            UPDATE round_progress SET total = total - 1 WHERE round = {current} AND n = OLD.n;
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS recognitions_counted AFTER INSERT ON recognitions BEGIN
+            UPDATE round_progress SET found = found + 1 WHERE round = NEW.round AND n = NEW.n;
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS recognitions_uncounted AFTER DELETE ON recognitions BEGIN
+            UPDATE round_progress SET found = found - 1 WHERE round = OLD.round AND n = OLD.n;
+        END
+    ''')
+
+def _rebuild_progress(c, round_id):
+    """Recount round_progress for round_id from scratch; only needed after a migration."""
+    c.execute("DELETE FROM round_progress WHERE round = ?", (round_id,))
+    c.execute("INSERT INTO round_progress (round, n, found, total) "
+              "SELECT ?, s.n, COUNT(r.code), COUNT(*) FROM solutions s "
+              "LEFT JOIN recognitions r ON r.round = ? AND r.n = s.n AND r.code = s.code "
+              "GROUP BY s.n", (round_id, round_id))
+
+def _current_round(conn):
+    return conn.execute("SELECT MAX(id) FROM rounds").fetchone()[0]
+
 def init_db():
     logger.debug(f"Initializing database: {DB_NAME}")
-    conn = sqlite3.connect(DB_NAME)
+    conn = get_connection()
     c = conn.cursor()
 
     try:
+        _create_round_tables(c)
+        if c.execute("SELECT 1 FROM rounds LIMIT 1").fetchone() is None:
+            c.execute("INSERT INTO rounds (started_at) VALUES (?)", (time.time(),))
+        round_id = _current_round(c)
+
+        columns = [row[1] for row in c.execute("PRAGMA table_info(solutions)")]
+        migrated = True
+        if "solution" in columns:
+            _migrate_text_solutions(c, round_id)
+        elif "recognized" in columns:
+            _migrate_recognized_flags(c, round_id)
+        else:
+            migrated = False
+            _create_solutions_table(c)
+        _create_progress_triggers(c)
+        if migrated:
+            _rebuild_progress(c, round_id)
+
         c.execute('''
-            CREATE TABLE IF NOT EXISTS solutions (
+            CREATE TABLE IF NOT EXISTS times (
+                method TEXT PRIMARY KEY,
+                time_taken REAL
+            )
+        ''')
+
+        # Append-only history of every timed run; times keeps only the latest
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS runs (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                solution TEXT UNIQUE,
-                recognized_by TEXT,
-                recognized INTEGER DEFAULT 0
+                method TEXT NOT NULL,
+                n INTEGER,
+                options TEXT,
+                started_at REAL NOT NULL,
+                duration REAL NOT NULL,
+                solutions INTEGER,
+                host TEXT,
+                stats TEXT
             )
         ''')
+        run_columns = [row[1] for row in c.execute("PRAGMA table_info(runs)")]
+        if "stats" not in run_columns:
+            c.execute("ALTER TABLE runs ADD COLUMN stats TEXT")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_runs_method_n_started ON runs (method, n, started_at)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_runs_started ON runs (started_at)")
 
+        # Checkpointed work units of sharded counting jobs (see shards.py)
         c.execute('''
-            CREATE TABLE IF NOT EXISTS times (
-                method TEXT PRIMARY KEY,
-                time_taken REAL
+            CREATE TABLE IF NOT EXISTS shards (
+                n INTEGER NOT NULL,
+                prefix TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                count INTEGER,
+                checksum INTEGER,
+                worker TEXT,
+                claimed_at REAL,
+                heartbeat_at REAL,
+                completed_at REAL,
+                PRIMARY KEY (n, prefix)
             )
         ''')
+        shard_columns = [row[1] for row in c.execute("PRAGMA table_info(shards)")]
+        if "heartbeat_at" not in shard_columns:
+            c.execute("ALTER TABLE shards ADD COLUMN heartbeat_at REAL")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_shards_n_status ON shards (n, status)")
 
         conn.commit()
         logger.debug("Database initialized successfully")
     except sqlite3.Error as e:
+        conn.rollback()
         logger.error(f"Database initialization error: {e}")
         raise
-    finally:
-        conn.close()
 
 def save_solution(solution):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("INSERT OR IGNORE INTO solutions (solution) VALUES (?)", (solution,))
-    conn.commit()
-    conn.close()
+    conn = get_connection()
+    with conn:
+        conn.execute("INSERT OR IGNORE INTO solutions (n, code) VALUES (?, ?)", _to_key(solution))
 
-def record_time(method, time_taken):
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("INSERT OR REPLACE INTO times (method, time_taken) VALUES (?, ?)", (method, time_taken))
-    conn.commit()
-    conn.close()
+def save_solutions(solutions, chunk_size=1000):
+    """Insert many solutions in one transaction, chunk_size rows per executemany.
 
-def recognize_solution(solution, player_name):
-    conn = sqlite3.connect(DB_NAME)
+    solutions may be any iterable (including a generator); it is consumed
+    lazily. Returns the number of rows actually inserted.
+    """
+    conn = get_connection()
     c = conn.cursor()
-    c.execute("SELECT recognized FROM solutions WHERE solution = ?", (solution,))
-    row = c.fetchone()
+    rows = (_to_key(solution) for solution in solutions)
+    inserted = 0
+    try:
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            c.executemany("INSERT OR IGNORE INTO solutions (n, code) VALUES (?, ?)", chunk)
+            inserted += c.rowcount
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logger.error(f"Bulk save failed: {e}")
+        raise
+    except BaseException:
+        conn.rollback()  # Never leave the cached connection inside a write transaction
+        raise
+    return inserted
+
+def record_time(method, time_taken, n=None, options=None, solutions=None, stats=None):
+    """Record a timed run: update the latest time for method and append it to the run history.
+
+    Method names are case-insensitive ("Sequential" and "sequential" are the
+    same series). options (engine settings) and stats (SearchStats.as_dict())
+    are stored as JSON.
+    """
+    method = method.strip().lower()
+    options_json = json.dumps(options, sort_keys=True) if options else None
+    stats_json = json.dumps(stats, sort_keys=True) if stats else None
+    conn = get_connection()
+    with conn:
+        conn.execute("INSERT OR REPLACE INTO times (method, time_taken) VALUES (?, ?)", (method, time_taken))
+        conn.execute("INSERT INTO runs (method, n, options, started_at, duration, solutions, host, stats) "
+                     "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                     (method, n, options_json, time.time() - time_taken, time_taken, solutions,
+                      platform.node(), stats_json))
+
+def _run_filter(method, n=None, since=None):
+    clauses = ["method = ?"]
+    params = [method.strip().lower()]
+    if n is not None:
+        clauses.append("n = ?")
+        params.append(n)
+    if since is not None:
+        clauses.append("started_at >= ?")
+        params.append(since)
+    return " AND ".join(clauses), params
+
+def get_run_history(method, n=None, since=None, limit=None):
+    """Return recorded runs for method (only the latest limit if given), oldest first."""
+    where, params = _run_filter(method, n, since)
+    query = ("SELECT method, n, options, started_at, duration, solutions, host, stats FROM runs "
+             f"WHERE {where} ORDER BY started_at DESC, id DESC")
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    rows = get_connection().execute(query, params).fetchall()
+    history = []
+    for method, n, options, started_at, duration, solutions, host, stats in reversed(rows):
+        history.append({
+            'method': method,
+            'n': n,
+            'options': json.loads(options) if options else {},
+            'started_at': started_at,
+            'duration': duration,
+            'solutions': solutions,
+            'host': host,
+            'stats': json.loads(stats) if stats else None
+        })
+    return history
+
+def get_run_percentiles(method, n=None, since=None):
+    """Return count, mean, p50 and p95 of run durations for method (None if no runs)."""
+    where, params = _run_filter(method, n, since)
+    durations = [row[0] for row in get_connection().execute(
+        f"SELECT duration FROM runs WHERE {where}", params)]
+    if not durations:
+        return None
+    return {
+        'count': len(durations),
+        'mean': sum(durations) / len(durations),
+        'p50': percentile(durations, 50),
+        'p95': percentile(durations, 95)
+    }
+
+def get_run_trend(method, n=None, since=None):
+    """Return per-day (date, count, p50, p95) of run durations for method, oldest day first."""
+    where, params = _run_filter(method, n, since)
+    rows = get_connection().execute(
+        "SELECT date(started_at, 'unixepoch'), duration FROM runs "
+        f"WHERE {where} ORDER BY started_at", params)
+    days = {}
+    for day, duration in rows:
+        days.setdefault(day, []).append(duration)
+    return [(day, len(durations), percentile(durations, 50), percentile(durations, 95))
+            for day, durations in days.items()]
 
-    if row is None:
-        conn.close()
+def _recognize(conn, round_id, key, player_name):
+    """Claim the solution at key for player_name in round round_id with one conditional INSERT.
+
+    The recognition row is only inserted when the solution is stored, and its
+    (round, n, code) primary key lets exactly one claim per round succeed, so
+    concurrent submitters of the same board cannot both win.
+    """
+    c = conn.execute("INSERT OR IGNORE INTO recognitions (round, n, code, recognized_by, recognized_at) "
+                     "SELECT ?, n, code, ?, ? FROM solutions WHERE n = ? AND code = ?",
+                     (round_id, player_name, time.time()) + key)
+    if c.rowcount == 1:
+        return True, "Solution recognized!"
+    if conn.execute("SELECT 1 FROM solutions WHERE n = ? AND code = ?", key).fetchone() is None:
         return False, "Solution not found."
+    return False, "Solution already recognized."
+
+def recognize_solution(solution, player_name):
+    key = _to_key(solution)
+    conn = get_connection()
+    with conn:
+        return _recognize(conn, _current_round(conn), key, player_name)
+
+def recognize_submissions(submissions):
+    """Recognize (solution, player_name) submissions in order, in one transaction.
+
+    Returns a list of (success, message) aligned with submissions, using
+    recognize_solution's messages. Used by the submission server to batch
+    commits without giving up per-submission results.
+    """
+    conn = get_connection()
+    with conn:
+        round_id = _current_round(conn)
+        return [_recognize(conn, round_id, _to_key(solution), player_name)
+                for solution, player_name in submissions]
 
-    if row[0] == 1:
-        conn.close()
-        return False, "Solution already recognized."
+def recognize_solutions(recognitions):
+    """Apply (solution, player_name) recognitions in a single transaction.
 
-    c.execute("UPDATE solutions SET recognized = 1, recognized_by = ? WHERE solution = ?", (player_name, solution))
-    conn.commit()
-    conn.close()
-    return True, "Solution recognized!"
+    Used as the write-behind path of the in-memory SolutionIndex; solutions
+    that are already recognized this round keep their original player.
+    """
+    rows = [_to_key(solution) + (player_name,) for solution, player_name in recognitions]
+    now = time.time()
+    conn = get_connection()
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO solutions (n, code) VALUES (?, ?)",
+                         [row[:2] for row in rows])
+        round_id = _current_round(conn)
+        conn.executemany("INSERT OR IGNORE INTO recognitions (round, n, code, recognized_by, recognized_at) "
+                         "VALUES (?, ?, ?, ?, ?)", [(round_id,) + row + (now,) for row in rows])
+
+def recognize_solutions_bulk(n, codes, player_name):
+    """Recognize many stored solutions of size n, given as encode_board codes.
+
+    All lookups and inserts run in one transaction. Returns a list of
+    (success, message) aligned with codes, using recognize_solution's
+    messages; a code repeated in the batch succeeds at most once.
+    """
+    codes = [_stored_code(n, int(code)) for code in codes]
+    conn = get_connection()
+    with conn:
+        # Untyped, so it holds integer codes and the BLOB codes of n >= 16 alike
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS bulk_keys (code PRIMARY KEY)")
+        conn.execute("DELETE FROM bulk_keys")
+        conn.executemany("INSERT OR IGNORE INTO bulk_keys (code) VALUES (?)", [(code,) for code in codes])
+        round_id = _current_round(conn)
+        status = dict(conn.execute(
+            "SELECT s.code, r.code IS NOT NULL FROM solutions s JOIN bulk_keys b ON s.code = b.code "
+            "LEFT JOIN recognitions r ON r.round = ? AND r.n = s.n AND r.code = s.code "
+            "WHERE s.n = ?", (round_id, n)))
+        conn.execute("INSERT OR IGNORE INTO recognitions (round, n, code, recognized_by, recognized_at) "
+                     "SELECT ?, n, code, ?, ? FROM solutions "
+                     "WHERE n = ? AND code IN (SELECT code FROM bulk_keys)",
+                     (round_id, player_name, time.time(), n))
+        conn.execute("DELETE FROM bulk_keys")
+
+    results = []
+    for code in codes:
+        if code not in status:
+            results.append((False, "Solution not found."))
+        elif status[code] == 1:
+            results.append((False, "Solution already recognized."))
+        else:
+            status[code] = 1
+            results.append((True, "Solution recognized!"))
+    return results
 
 def all_solutions_recognized():
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("SELECT COUNT(*) FROM solutions WHERE recognized = 0")
-    count = c.fetchone()[0]
-    conn.close()
-    return count == 0
+    """True once every stored solution is recognized in the current round; reads only counter rows."""
+    conn = get_connection()
+    c = conn.execute("SELECT EXISTS (SELECT 1 FROM round_progress "
+                     "WHERE round = (SELECT MAX(id) FROM rounds) AND found < total)")
+    return c.fetchone()[0] == 0
+
+def count_unrecognized():
+    """Return {n: number of stored solutions of size n not yet recognized this round}."""
+    conn = get_connection()
+    return dict(conn.execute("SELECT n, total - found FROM round_progress "
+                             "WHERE round = (SELECT MAX(id) FROM rounds) AND total > 0"))
+
+def start_round():
+    """End the current round and start a new one with nothing recognized. Returns its id.
+
+    Only the rounds row and one counter row per board size are written, so
+    this takes the same time however many solutions are stored. Earlier
+    rounds keep their recognitions.
+    """
+    now = time.time()
+    conn = get_connection()
+    with conn:
+        conn.execute("UPDATE rounds SET ended_at = ? WHERE id = (SELECT MAX(id) FROM rounds)", (now,))
+        previous = _current_round(conn)
+        round_id = conn.execute("INSERT INTO rounds (started_at) VALUES (?)", (now,)).lastrowid
+        conn.execute("INSERT INTO round_progress (round, n, found, total) "
+                     "SELECT ?, n, 0, total FROM round_progress WHERE round = ?", (round_id, previous))
+    return round_id
 
 def reset_solutions():
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("UPDATE solutions SET recognized = 0, recognized_by = NULL")
-    conn.commit()
-    conn.close()
+    start_round()
+
+def current_round():
+    return _current_round(get_connection())
+
+def get_rounds():
+    """Return every round, oldest first, with its progress summed over board sizes."""
+    rows = get_connection().execute(
+        "SELECT r.id, r.started_at, r.ended_at, COALESCE(SUM(p.found), 0), COALESCE(SUM(p.total), 0) "
+        "FROM rounds r LEFT JOIN round_progress p ON p.round = r.id GROUP BY r.id ORDER BY r.id")
+    return [{'round': round_id, 'started_at': started_at, 'ended_at': ended_at,
+             'found': found, 'total': total}
+            for round_id, started_at, ended_at, found, total in rows]
+
+def get_round_progress(round_id=None):
+    """Return {n: (found, total)} for round_id, by default the current round."""
+    conn = get_connection()
+    rows = conn.execute("SELECT n, found, total FROM round_progress WHERE round = ?",
+                        (_round_or_current(conn, round_id),))
+    return {n: (found, total) for n, found, total in rows}
 
 # New function to get all stored data
 def get_stored_data():
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("SELECT solution, recognized_by, recognized FROM solutions")
-    rows = c.fetchall()
-    conn.close()
-    
     # Return the stored data as a list of dictionaries for easier handling
     stored_data = []
-    for row in rows:
+    for solution, recognized_by, recognized in get_stored_solutions():
         stored_data.append({
-            'solution': row[0],
-            'recognized_by': row[1],
-            'recognized': row[2]
+            'solution': solution,
+            'recognized_by': recognized_by,
+            'recognized': recognized
         })
     
     return stored_data
-def get_stored_solutions():
-    conn = sqlite3.connect(DB_NAME)
-    c = conn.cursor()
-    c.execute("SELECT solution, recognized_by, recognized FROM solutions")
-    rows = c.fetchall()
-    conn.close()
-    return rows
+def stored_solution_count(n):
+    """Number of solutions of size n in the solutions table, read from the round's counter row."""
+    row = get_connection().execute(
+        "SELECT total FROM round_progress WHERE round = (SELECT MAX(id) FROM rounds) AND n = ?",
+        (n,)).fetchone()
+    return row[0] if row else 0
+
+def _round_or_current(conn, round_id):
+    return _current_round(conn) if round_id is None else round_id
+
+# Solutions with their recognition in one round (the first parameter)
+_SOLUTIONS_WITH_RECOGNITION = (
+    "SELECT s.n, s.code, r.recognized_by, r.code IS NOT NULL FROM solutions s "
+    "LEFT JOIN recognitions r ON r.round = ? AND r.n = s.n AND r.code = s.code ")
+
+def get_stored_solutions(round_id=None):
+    """Return (board, recognized_by, recognized) rows, boards decoded to column tuples.
+
+    Recognition is as of round_id, by default the current round.
+    """
+    conn = get_connection()
+    rows = conn.execute(_SOLUTIONS_WITH_RECOGNITION + "ORDER BY s.n, s.code",
+                        (_round_or_current(conn, round_id),))
+    return [(_from_key(n, code), recognized_by, recognized)
+            for n, code, recognized_by, recognized in rows]
+
+def get_recognitions(n, round_id=None):
+    """Return {encode_board code: player name} for the size-n solutions recognized in round_id."""
+    conn = get_connection()
+    rows = conn.execute("SELECT code, recognized_by FROM recognitions WHERE round = ? AND n = ?",
+                        (_round_or_current(conn, round_id), n))
+    return {int.from_bytes(code, "big") if isinstance(code, bytes) else code: recognized_by
+            for code, recognized_by in rows}
+
+def get_solutions_page(after=None, limit=200, recognized=None, player=None, n=None, round_id=None):
+    """Return one page of stored solutions in key order, for lazy viewers.
+
+    after is the cursor returned by the previous page (None for the first).
+    Filters: recognized (True/False), player (substring of recognized_by)
+    and n; recognition is as of round_id, by default the current round.
+    Returns (rows, cursor) where rows are (board, recognized_by, recognized)
+    and cursor is None once there are no more rows.
+    """
+    conn = get_connection()
+    clauses = []
+    params = [_round_or_current(conn, round_id)]
+    if after is not None:
+        clauses.append("(s.n, s.code) > (?, ?)")
+        params.extend(after)
+    if recognized is not None:
+        clauses.append("r.code IS NOT NULL" if recognized else "r.code IS NULL")
+    if player:
+        clauses.append("r.recognized_by LIKE ?")
+        params.append(f"%{player}%")
+    if n is not None:
+        clauses.append("s.n = ?")
+        params.append(n)
+    where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+    params.append(limit)
+    rows = conn.execute(_SOLUTIONS_WITH_RECOGNITION + f"{where}ORDER BY s.n, s.code LIMIT ?",
+                        params).fetchall()
+    page = [(_from_key(n, code), recognized_by, recognized)
+            for n, code, recognized_by, recognized in rows]
+    cursor = (rows[-1][0], rows[-1][1]) if len(rows) == limit else None
+    return page, cursor
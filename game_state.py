@@ -0,0 +1,94 @@
+class BoardState:
+    """Queens on an n x n board (at most one per row) with incremental conflict counters.
+
+    Column and diagonal occupancy counts are updated in O(1) per placement,
+    as is the number of attacking queen pairs, so whether the board is a
+    solution is known without rescanning it.
+    """
+
+    def __init__(self, n=8):
+        self.n = n
+        self.board = [-1] * n  # -1 means no queen in that row
+        self.col_count = [0] * n
+        self.diag_count = [0] * (2 * n - 1)  # indexed by row - col + n - 1
+        self.anti_count = [0] * (2 * n - 1)  # indexed by row + col
+        self.placed = 0
+        self.conflicts = 0  # number of attacking pairs
+
+    def place(self, row, col):
+        """Put the queen of row on col, moving it if the row already has one."""
+        if self.board[row] == col:
+            return
+        if self.board[row] != -1:
+            self.remove(row)
+        d, a = row - col + self.n - 1, row + col
+        self.conflicts += self.col_count[col] + self.diag_count[d] + self.anti_count[a]
+        self.col_count[col] += 1
+        self.diag_count[d] += 1
+        self.anti_count[a] += 1
+        self.board[row] = col
+        self.placed += 1
+
+    def remove(self, row):
+        """Take the queen off row, if there is one."""
+        col = self.board[row]
+        if col == -1:
+            return
+        d, a = row - col + self.n - 1, row + col
+        self.col_count[col] -= 1
+        self.diag_count[d] -= 1
+        self.anti_count[a] -= 1
+        self.conflicts -= self.col_count[col] + self.diag_count[d] + self.anti_count[a]
+        self.board[row] = -1
+        self.placed -= 1
+
+    def clear(self):
+        for row in range(self.n):
+            self.remove(row)
+
+    def attackers(self, row, col):
+        """Number of queens outside row that attack square (row, col)."""
+        count = (self.col_count[col] + self.diag_count[row - col + self.n - 1]
+                 + self.anti_count[row + col])
+        if self.board[row] == col:
+            count -= 3  # the queen on this square is in all three of its own lines
+        return count
+
+    def is_attacked(self, row, col):
+        return self.attackers(row, col) > 0
+
+    def lines_through(self, row, col):
+        """Set of squares sharing a row, column or diagonal with (row, col), itself included."""
+        n = self.n
+        squares = {(row, c) for c in range(n)} | {(r, col) for r in range(n)}
+        for r in range(n):
+            for c in (col + r - row, col - r + row):
+                if 0 <= c < n:
+                    squares.add((r, c))
+        return squares
+
+    def attacked_squares(self):
+        """Set of (row, col) squares attacked by a queen in another row."""
+        return {(row, col) for row in range(self.n) for col in range(self.n)
+                if self.is_attacked(row, col)}
+
+    def conflicting_queens(self):
+        """Set of (row, col) queens attacked by at least one other queen."""
+        return {(row, col) for row, col in enumerate(self.board)
+                if col != -1 and self.attackers(row, col) > 0}
+
+    def is_complete(self):
+        return self.placed == self.n
+
+    def is_solution(self):
+        return self.placed == self.n and self.conflicts == 0
+
+    def conflict_reason(self):
+        """Why the board is not a solution, or None if it is one."""
+        if not self.is_complete():
+            return "You must place a queen in every row."
+        if any(count > 1 for count in self.col_count):
+            return "Queens must be in different columns."
+        if self.conflicts:
+            return "Queens must not share a diagonal."
+        return None
@@ -0,0 +1,68 @@
+from functools import lru_cache
+from solution_cache import SolutionCache, get_solutions
+
+
+class HintIndex:
+    """Bitset index over every solution of one board size, for dead-end-free hints.
+
+    For each square the index keeps an int whose bit i is set when solution i
+    has a queen there. ANDing the bitsets of the queens already placed leaves
+    exactly the solutions the board can still be completed to, whatever rows
+    the player has filled.
+    """
+
+    def __init__(self, n=8, solutions=None):
+        self.n = n
+        self.solutions = list(solutions) if solutions is not None else get_solutions(n)
+        self.all = (1 << len(self.solutions)) - 1
+        self.cells = []
+        for row in range(n):
+            columns = _columns(self.solutions, row)
+            self.cells.append([_bitset(columns, col) for col in range(n)])
+
+    def candidates(self, board):
+        """Bitset of the solutions that agree with every queen on board (-1 = empty row)."""
+        mask = self.all
+        for row, col in enumerate(board):
+            if col != -1:
+                mask &= self.cells[row][col]
+                if not mask:
+                    break
+        return mask
+
+    def completions(self, board):
+        """Number of full solutions the partial board can still reach."""
+        return bin(self.candidates(board)).count("1")
+
+    def hint(self, board):
+        """Return (row, col) for the first empty row such that the board stays solvable.
+
+        Returns None when no solution contains the queens already placed, or
+        when there is no empty row left.
+        """
+        mask = self.candidates(board)
+        if not mask:
+            return None
+        solution = self.solutions[(mask & -mask).bit_length() - 1]
+        for row, col in enumerate(board):
+            if col == -1:
+                return row, solution[row]
+        return None
+
+
+def _columns(solutions, row):
+    """bytes holding the column of the queen in row, one per solution."""
+    if isinstance(solutions, SolutionCache):
+        return solutions.columns(row)
+    return bytes(board[row] for board in solutions)
+
+def _bitset(columns, col):
+    """Int whose bit i is set when columns[i] == col, built without a Python-level loop."""
+    digits = columns.translate(bytes(49 if value == col else 48 for value in range(256)))  # b"1"/b"0"
+    return int(digits[::-1], 2) if digits else 0
+
+
+@lru_cache(maxsize=None)
+def get_hint_index(n=8):
+    """Build the HintIndex for n once per process."""
+    return HintIndex(n)
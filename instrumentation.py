@@ -0,0 +1,58 @@
+class SearchStats:
+    """Counters collected by an instrumented backtracking search.
+
+    Pass an instance as stats= to the solver entry points; searches run
+    without one take the uninstrumented code path.
+    """
+
+    def __init__(self, n=8):
+        self.n = n
+        self.nodes = 0           # queens placed
+        self.prunes = 0          # squares rejected by the column/diagonal masks
+        self.solutions = 0
+        self.depth_nodes = [0] * n
+        self.subtree_time = {}   # first placed column -> seconds spent below it
+        self.elapsed = 0.0
+        self.workers = {}        # worker (pid or thread name) -> counters of the tasks it ran
+
+    def branching_factors(self):
+        """Average number of children per node at each depth."""
+        return [self.depth_nodes[d + 1] / self.depth_nodes[d] if self.depth_nodes[d] else 0.0
+                for d in range(self.n - 1)]
+
+    def merge(self, other, worker=None):
+        """Add the counters of other (a SearchStats or its as_dict) into this one.
+
+        With worker (a pid or thread name), they are also tallied under it.
+        """
+        if isinstance(other, SearchStats):
+            other = other.as_dict()
+        self.nodes += other["nodes"]
+        self.prunes += other["prunes"]
+        self.solutions += other["solutions"]
+        self.elapsed += other["elapsed"]
+        for depth, count in enumerate(other["depth_nodes"]):
+            self.depth_nodes[depth] += count
+        for col, seconds in other["subtree_time"].items():
+            col = int(col)
+            self.subtree_time[col] = self.subtree_time.get(col, 0.0) + seconds
+        if worker is not None:
+            totals = self.workers.setdefault(worker, {"tasks": 0, "nodes": 0, "solutions": 0, "time": 0.0})
+            totals["tasks"] += 1
+            totals["nodes"] += other["nodes"]
+            totals["solutions"] += other["solutions"]
+            totals["time"] += other["elapsed"]
+
+    def as_dict(self):
+        return {
+            "n": self.n,
+            "nodes": self.nodes,
+            "prunes": self.prunes,
+            "solutions": self.solutions,
+            "depth_nodes": list(self.depth_nodes),
+            "branching_factors": self.branching_factors(),
+            "subtree_time": dict(self.subtree_time),
+            "elapsed": self.elapsed,
+            "workers": {str(worker): dict(totals) for worker, totals in self.workers.items()},
+        }
+
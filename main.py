@@ -1,16 +1,19 @@
 import sys
+import logging
 from PyQt5.QtWidgets import QApplication
-from database import init_db
+from database import init_db, close_connections
 from ui import GameUI
-from database import get_stored_solutions
 
 
 def main():
+    logging.basicConfig(level=logging.DEBUG)
     init_db()
     app = QApplication(sys.argv)
     game = GameUI()
     game.show()
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    close_connections()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
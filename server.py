@@ -0,0 +1,241 @@
+"""Headless submission server: many players recognizing solutions at once.
+
+Clients connect over a local TCP or Unix socket and exchange one JSON
+object per line. A submission looks like
+
+    {"board": [0, 4, 7, 5, 2, 6, 1, 3], "player": "Alice"}
+
+and is answered with
+
+    {"ok": true, "message": "Solution recognized!", "remaining": 91, "complete": false}
+
+{"op": "status", "n": 8} reports the remaining count without submitting.
+Malformed requests get {"ok": false, "error": "..."} and the connection
+stays open.
+
+Every submission goes through a single writer task that drains whatever
+has queued up into one transaction, so commits are batched under load
+while each claim is still a conditional INSERT into recognitions. The
+remaining counts are re-read from the current round's counters after
+every committed batch and for every status request, so they follow new
+rounds and recognitions written by other processes.
+"""
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from database import init_db, recognize_submissions, count_unrecognized, close_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+BATCH_SIZE = 512  # submissions per transaction at most
+
+
+class SubmissionServer:
+    """Serve recognitions over a local socket; pass path to listen on a Unix socket instead."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None, batch_size=BATCH_SIZE):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.batch_size = batch_size
+        self.remaining = {}  # n -> stored solutions not yet recognized, as of the last read
+        self.commits = 0
+        self._server = None
+        self._queue = None
+        self._writer_task = None
+        # One thread owns the database connection, which serializes every claim.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="submissions")
+
+    @property
+    def address(self):
+        """The (host, port) actually bound, or the socket path."""
+        if self.path is not None:
+            return self.path
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self.remaining = await loop.run_in_executor(self._executor, count_unrecognized)
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop())
+        if self.path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        logger.info(f"Submission server listening on {self.address}")
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        # Only the executor thread's connection; other threads of an embedding process keep theirs
+        await asyncio.get_running_loop().run_in_executor(self._executor, close_connection)
+        self._executor.shutdown()
+
+    async def status(self, n):
+        loop = asyncio.get_running_loop()
+        self.remaining = await loop.run_in_executor(self._executor, count_unrecognized)
+        return {"ok": True, "n": n, **_progress(self.remaining.get(n))}
+
+    async def submit(self, board, player_name):
+        """Queue one recognition and wait for its committed (success, message)."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((board, player_name, future))
+        return await future
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            submissions = [(board, player_name) for board, player_name, _ in batch]
+            try:
+                results, self.remaining = await loop.run_in_executor(
+                    self._executor, _recognize_batch, submissions)
+            except Exception as e:
+                logger.error(f"Error recognizing submissions: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.commits += 1
+            for (_, _, future), (success, message) in zip(batch, results):
+                if not future.done():
+                    future.set_result((success, message))
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = await self._reply(line)
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _reply(self, line):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            if request.get("op", "submit") == "status":
+                return await self.status(int(request.get("n", 8)))
+            board, player_name = _parse_submission(request)
+        except (ValueError, TypeError) as e:
+            return {"ok": False, "error": str(e)}
+
+        n = len(board)
+        try:
+            success, message = await self.submit(board, player_name)
+        except Exception as e:
+            return {"ok": False, "error": f"Error recognizing solution: {e}"}
+        return {"ok": success, "message": message, **_progress(self.remaining.get(n))}
+
+
+def _recognize_batch(submissions):
+    """Executor job: commit one batch, then read the counters it left behind."""
+    return recognize_submissions(submissions), count_unrecognized()
+
+def _progress(remaining):
+    return {"remaining": remaining, "complete": remaining == 0}
+
+def _parse_submission(request):
+    board = request.get("board")
+    player_name = request.get("player")
+    if not isinstance(board, list) or not board:
+        raise ValueError("board must be a non-empty list of columns")
+    if any(not isinstance(col, int) or isinstance(col, bool) or not 0 <= col < len(board)
+           for col in board):
+        raise ValueError("board columns must be integers in 0..n-1")
+    if not isinstance(player_name, str) or not player_name.strip():
+        raise ValueError("player must be a non-empty name")
+    return board, player_name.strip()
+
+
+class SubmissionClient:
+    """Line-JSON client for SubmissionServer. Use SubmissionClient.connect(...)."""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, message):
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Submission server closed the connection")
+        return json.loads(line)
+
+    async def submit(self, board, player_name):
+        return await self.request({"board": list(board), "player": player_name})
+
+    async def status(self, n=8):
+        return await self.request({"op": "status", "n": n})
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def submit_solution(board, player_name, host=DEFAULT_HOST, port=DEFAULT_PORT, path=None):
+    """Blocking one-shot submission; returns the server's reply dict."""
+    async def once():
+        client = await SubmissionClient.connect(host, port, path)
+        try:
+            return await client.submit(board, player_name)
+        finally:
+            await client.close()
+    return asyncio.run(once())
+
+
+async def _serve(args):
+    server = SubmissionServer(args.host, args.port, args.socket)
+    await server.start()
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Eight Queens submission server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", help="listen on this Unix socket path instead of TCP")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    init_db()
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Checkpointed, sharded solution counting for long-running large-N jobs.
+
+The search tree for n is split into shards, one per conflict-free placement
+of the first depth rows. Shards live in the database's shards table, so
+a job survives crashes and can be worked on by several processes on one
+machine (the database runs in WAL mode, which relies on shared memory and
+does not work on network filesystems):
+
+    plan_shards(17, depth=3)        # once; re-planning the same job is a no-op
+    run_worker(17)                  # in as many processes as you like
+    merge_shards(17)                # verified total once every shard is done
+
+A worker claims one pending shard at a time, counts it and records the
+result with a checksum. While it counts, a background thread refreshes the
+shard's heartbeat_at every HEARTBEAT_INTERVAL seconds; a running shard whose
+heartbeat is more than stale_after seconds old is assumed lost with its
+worker and goes back to pending. Workers keep polling for such shards until
+the whole job is done.
+"""
+import os
+import platform
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+import database
+from solver import _prefixes, _count_below
+
+HEARTBEAT_INTERVAL = 30  # seconds between heartbeats of a running shard
+POLL_INTERVAL = 1.0  # seconds between looks at running shards once nothing is pending
+STALE_AFTER = 10 * 60  # seconds a claim may go without a heartbeat before it is reclaimed
+
+# Solutions per board size (OEIS A000170), for verifying merged counts
+KNOWN_COUNTS = [
+    1, 1, 0, 0, 2, 10, 4, 40, 92, 352, 724, 2680, 14200, 73712, 365596, 2279184, 14772512,
+    95815104, 666090624, 4968057848, 39029188884, 314666222712, 2691008701644, 24233937684440,
+    227514171973736, 2207893435808352, 22317699616364044, 234907967154122528,
+]
+
+
+def _prefix_text(prefix):
+    return ",".join(map(str, prefix))
+
+def _parse_prefix(text):
+    return tuple(int(col) for col in text.split(",")) if text else ()
+
+def shard_checksum(n, prefix, count):
+    """CRC-32 of a shard's result, so damaged or hand-edited rows are caught by the merge."""
+    return zlib.crc32(f"{n}|{_prefix_text(prefix)}|{count}".encode())
+
+def default_worker():
+    return f"{platform.node()}:{os.getpid()}"
+
+
+def plan_shards(n, depth=2):
+    """Create the shards for n, one per prefix of depth rows. Returns the number of shards.
+
+    Planning an existing job again keeps its progress; planning it with a
+    different depth raises ValueError.
+    """
+    depth = min(depth, n)
+    conn = database.get_connection()
+    existing = conn.execute("SELECT prefix FROM shards WHERE n = ? LIMIT 1", (n,)).fetchone()
+    if existing is not None:
+        if len(_parse_prefix(existing[0])) != depth:
+            raise ValueError(f"Shards for n={n} were planned with depth {len(_parse_prefix(existing[0]))}")
+        return conn.execute("SELECT COUNT(*) FROM shards WHERE n = ?", (n,)).fetchone()[0]
+    prefixes = _prefixes(n, depth)
+    with conn:
+        conn.executemany("INSERT OR IGNORE INTO shards (n, prefix, status) VALUES (?, ?, 'pending')",
+                         [(n, _prefix_text(prefix)) for prefix in prefixes])
+    return len(prefixes)
+
+def claim_shard(n, worker=None):
+    """Atomically mark the next pending shard of n as running for worker.
+
+    Returns its prefix, or None when no shard is pending. The write lock is
+    taken before looking, so two workers never claim the same shard.
+    """
+    conn = database.get_connection()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("SELECT prefix FROM shards WHERE n = ? AND status = 'pending' "
+                           "ORDER BY rowid LIMIT 1", (n,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        conn.execute("UPDATE shards SET status = 'running', worker = ?, claimed_at = ?, heartbeat_at = ? "
+                     "WHERE n = ? AND prefix = ?", (worker or default_worker(), now, now, n, row[0]))
+    return _parse_prefix(row[0])
+
+def heartbeat(n, prefix, worker=None):
+    """Mark a running shard as alive. Returns False if worker no longer holds it."""
+    conn = database.get_connection()
+    with conn:
+        c = conn.execute("UPDATE shards SET heartbeat_at = ? "
+                         "WHERE n = ? AND prefix = ? AND status = 'running' AND worker = ?",
+                         (time.time(), n, _prefix_text(prefix), worker or default_worker()))
+    return c.rowcount == 1
+
+def _beat(n, worker, holding, stop, interval):
+    """Heartbeat thread: keep the (prefix, lost) shard in holding alive until stop is set.
+
+    Sets lost once the shard has been reclaimed from worker.
+    """
+    while not stop.wait(interval):
+        if holding:
+            prefix, lost = holding[0]
+            if not heartbeat(n, prefix, worker):
+                lost.set()
+
+def run_shard(n, prefix, cancel=None):
+    """Count the solutions below prefix. Returns (count, checksum), or None if cancel was set."""
+    count = _count_below(n, prefix, cancel)
+    if count is None:
+        return None
+    return count, shard_checksum(n, prefix, count)
+
+def complete_shard(n, prefix, count, checksum, worker=None):
+    """Record a shard's result. Returns False if it had already been completed."""
+    conn = database.get_connection()
+    with conn:
+        c = conn.execute("UPDATE shards SET status = 'done', count = ?, checksum = ?, worker = ?, "
+                         "completed_at = ? WHERE n = ? AND prefix = ? AND status != 'done'",
+                         (count, checksum, worker or default_worker(), time.time(), n,
+                          _prefix_text(prefix)))
+    return c.rowcount == 1
+
+def reclaim_stale(n, stale_after=STALE_AFTER):
+    """Return running shards with no heartbeat for stale_after seconds to pending. Returns how many."""
+    conn = database.get_connection()
+    with conn:
+        c = conn.execute("UPDATE shards SET status = 'pending', worker = NULL, claimed_at = NULL, "
+                         "heartbeat_at = NULL WHERE n = ? AND status = 'running' "
+                         "AND COALESCE(heartbeat_at, claimed_at) < ?",
+                         (n, time.time() - stale_after))
+    return c.rowcount
+
+def run_worker(n, worker=None, max_shards=None, stale_after=STALE_AFTER, db=None,
+               heartbeat_interval=HEARTBEAT_INTERVAL, poll_interval=POLL_INTERVAL):
+    """Claim, count and complete shards of n until every shard is done. Returns how many it ran.
+
+    While nothing is pending but other shards are still running, the worker
+    polls every poll_interval seconds and picks up any whose heartbeat
+    goes stale, so a job resumes after a crash without another start. A
+    shard reclaimed from this worker mid-count is abandoned. db names the
+    shared database file when running in a fresh process; DB_NAME is
+    restored before returning.
+    """
+    saved_db = database.DB_NAME
+    if db is not None:
+        database.DB_NAME = db
+    worker = worker or default_worker()
+    done = 0
+    holding = []
+    stop = threading.Event()
+    beat = threading.Thread(target=_beat, args=(n, worker, holding, stop, heartbeat_interval),
+                            name="shard-heartbeat", daemon=True)
+    try:
+        reclaim_stale(n, stale_after)
+        beat.start()
+        while max_shards is None or done < max_shards:
+            prefix = claim_shard(n, worker)
+            if prefix is None:
+                if not shard_progress(n).get("running"):
+                    break
+                time.sleep(poll_interval)
+                reclaim_stale(n, stale_after)
+                continue
+            lost = threading.Event()
+            holding[:] = [(prefix, lost)]
+            result = run_shard(n, prefix, cancel=lost)
+            holding.clear()
+            if result is None:
+                continue  # Reclaimed by another worker
+            complete_shard(n, prefix, *result, worker)
+            done += 1
+    finally:
+        stop.set()
+        if beat.is_alive():
+            beat.join()
+        database.DB_NAME = saved_db
+    return done
+
+def run_workers(n, processes=None, stale_after=STALE_AFTER, poll_interval=POLL_INTERVAL):
+    """Run one worker per process against DB_NAME until the job is finished."""
+    processes = processes or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [executor.submit(run_worker, n, None, None, stale_after, database.DB_NAME,
+                                   HEARTBEAT_INTERVAL, poll_interval)
+                   for _ in range(processes)]
+        return sum(future.result() for future in futures)
+
+def shard_progress(n):
+    """Return {status: number of shards} for n."""
+    rows = database.get_connection().execute(
+        "SELECT status, COUNT(*) FROM shards WHERE n = ? GROUP BY status", (n,))
+    return dict(rows)
+
+def merge_shards(n, recheck=0):
+    """Sum the shard counts for n after verifying the job. Returns the total.
+
+    Verification: the shards are exactly the plan's prefixes, every one is
+    done with a matching checksum, recheck randomly chosen shards give the
+    same count when run again, and the total matches the known count for n
+    where there is one. Any failure raises ValueError.
+    """
+    rows = database.get_connection().execute(
+        "SELECT prefix, status, count, checksum FROM shards WHERE n = ? ORDER BY rowid", (n,)).fetchall()
+    if not rows:
+        raise ValueError(f"No shards planned for n={n}")
+    prefixes = [_parse_prefix(prefix) for prefix, _, _, _ in rows]
+    if sorted(prefixes) != sorted(_prefixes(n, len(prefixes[0]))):
+        raise ValueError(f"Shards for n={n} do not cover the search tree")
+    pending = [prefix for prefix, (_, status, _, _) in zip(prefixes, rows) if status != "done"]
+    if pending:
+        raise ValueError(f"{len(pending)} of {len(rows)} shards for n={n} are not done")
+    for prefix, (_, _, count, checksum) in zip(prefixes, rows):
+        if shard_checksum(n, prefix, count) != checksum:
+            raise ValueError(f"Checksum mismatch for n={n} shard {_prefix_text(prefix)}")
+    for index in random.sample(range(len(rows)), min(recheck, len(rows))):
+        if run_shard(n, prefixes[index])[0] != rows[index][2]:
+            raise ValueError(f"Recount of n={n} shard {_prefix_text(prefixes[index])} disagrees")
+
+    total = sum(count for _, _, count, _ in rows)
+    if n < len(KNOWN_COUNTS) and total != KNOWN_COUNTS[n]:
+        raise ValueError(f"n={n} merged to {total} solutions, expected {KNOWN_COUNTS[n]}")
+    return total
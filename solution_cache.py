@@ -0,0 +1,193 @@
+"""Persistent per-N solution cache, memory-mapped for zero-copy reads.
+
+The solution set of an n x n board never changes, so after the first search
+it is kept in CACHE_DIR/n<N>.qsol: a HEADER (magic, version, n, record
+width, record count, CRC-32 of the records) followed by one fixed-width
+big-endian encode_board code per solution, in solve_bitboard order.
+A file whose header or checksum does not match is treated as a miss and
+rebuilt. CacheWriter builds a file as boards arrive, so a search can be
+cached without holding its solutions in memory.
+"""
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from itertools import islice
+from solver import iter_solutions
+from utils import bits_per_row, code_width, encode_board, decode_board
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "solution_cache"
+MAGIC = b"NQCACHE\0"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHQI")  # magic, version, n, width, count, crc32
+
+WRITE_CHUNK = 65536  # boards encoded per write by write_cache
+
+# Verified caches already mapped by this process, keyed by file path
+_open_caches = {}
+_open_lock = threading.Lock()
+
+
+class SolutionCache:
+    """Read-only sequence of the boards stored in one cache file.
+
+    Boards are decoded on access, so indexing and slicing the file cost no
+    more than the records touched.
+    """
+
+    def __init__(self, path, mm, n, width, count):
+        self.path = path
+        self.n = n
+        self.width = width
+        self._mm = mm
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def code(self, i):
+        """The encode_board code of board i."""
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("solution index out of range")
+        start = HEADER.size + i * self.width
+        return int.from_bytes(self._mm[start:start + self.width], "big")
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        return decode_board(self.code(i), self.n)
+
+    def __iter__(self):
+        for code in self.codes():
+            yield decode_board(code, self.n)
+
+    def codes(self):
+        """Yield every board's encode_board code, in file order."""
+        mm, width = self._mm, self.width
+        for start in range(HEADER.size, HEADER.size + self._count * width, width):
+            yield int.from_bytes(mm[start:start + width], "big")
+
+    def columns(self, row):
+        """bytes holding the queen's column in row for every board, in file order.
+
+        When a row's bits never straddle a byte (bits_per_row divides 8, as for
+        n = 9..16) the column is read with one strided slice of the map.
+        """
+        bits = bits_per_row(self.n)
+        mask = (1 << bits) - 1
+        if 8 % bits == 0:
+            per_byte = 8 // bits
+            first = HEADER.size + self.width - 1 - row // per_byte
+            shift = (row % per_byte) * bits
+            table = bytes((value >> shift) & mask for value in range(256))
+            return self._mm[first:HEADER.size + self._count * self.width:self.width].translate(table)
+        shift = row * bits
+        return bytes((code >> shift) & mask for code in self.codes())
+
+
+class CacheWriter:
+    """Write the cache file for n incrementally.
+
+    Records go to a temporary file in CACHE_DIR as add() is called; commit()
+    fills in the header and atomically replaces the cache file, discard()
+    throws the partial file away.
+    """
+
+    def __init__(self, n):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        self.n = n
+        self.width = code_width(n)
+        self.count = 0
+        self._crc = 0
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(HEADER.pack(MAGIC, VERSION, n, self.width, 0, 0))  # Rewritten by commit
+
+    def add(self, boards):
+        records = b"".join(encode_board(board).to_bytes(self.width, "big") for board in boards)
+        self._file.write(records)
+        self._crc = zlib.crc32(records, self._crc)
+        self.count += len(records) // self.width
+
+    def commit(self):
+        try:
+            self._file.seek(0)
+            self._file.write(HEADER.pack(MAGIC, VERSION, self.n, self.width, self.count, self._crc))
+            self._file.close()
+            os.replace(self._tmp_path, cache_path(self.n))
+        except BaseException:
+            self.discard()
+            raise
+        with _open_lock:
+            # Holders of the replaced cache keep its map until they drop it
+            _open_caches.pop(cache_path(self.n), None)
+
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.unlink(self._tmp_path)
+
+
+def cache_path(n):
+    return os.path.join(CACHE_DIR, f"n{n}.qsol")
+
+def open_cache(n):
+    """Return the SolutionCache for n, or None when there is no valid cache file."""
+    path = cache_path(n)
+    with _open_lock:
+        cache = _open_caches.get(path)
+        if cache is not None:
+            return cache
+        try:
+            with open(path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        cache = _verify(path, mm, n)
+        if cache is None:
+            mm.close()
+            return None
+        _open_caches[path] = cache
+        return cache
+
+def _verify(path, mm, n):
+    if len(mm) < HEADER.size:
+        logger.warning(f"Ignoring truncated solution cache {path}")
+        return None
+    magic, version, stored_n, width, count, crc = HEADER.unpack_from(mm)
+    if magic != MAGIC or version != VERSION or stored_n != n or width != code_width(n):
+        logger.warning(f"Ignoring solution cache {path} with an unexpected header")
+        return None
+    if len(mm) != HEADER.size + count * width or zlib.crc32(memoryview(mm)[HEADER.size:]) != crc:
+        logger.warning(f"Ignoring corrupt solution cache {path}")
+        return None
+    return SolutionCache(path, mm, n, width, count)
+
+def write_cache(n, boards):
+    """Store boards (any iterable) as the cache for n, replacing any previous file atomically."""
+    writer = CacheWriter(n)
+    try:
+        boards = iter(boards)
+        for chunk in iter(lambda: list(islice(boards, WRITE_CHUNK)), []):
+            writer.add(chunk)
+    except BaseException:
+        writer.discard()
+        raise
+    writer.commit()
+
+def get_solutions(n):
+    """Every solution for n as a SolutionCache, solving and caching them on a miss."""
+    cache = open_cache(n)
+    if cache is None:
+        write_cache(n, iter_solutions(n))
+        cache = open_cache(n)
+    return cache
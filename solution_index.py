@@ -0,0 +1,69 @@
+import threading
+from database import get_recognitions, recognize_solutions, reset_solutions
+from solution_cache import get_solutions
+from utils import encode_board
+
+
+class SolutionIndex:
+    """In-memory set of valid solutions for one board size plus their recognition state.
+
+    Boards are held as their packed encode_board codes. Submissions are
+    looked up in the solution set and recognized without touching disk; the
+    recognitions are queued and written to the database by flush(). Conflict
+    messages for the player come from game_state.BoardState.
+    """
+
+    def __init__(self, n=8):
+        self.n = n
+        self.solutions = frozenset()
+        self.recognized = {}  # board code -> player name
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def warm(self):
+        """Load the solution set from the solution cache and this round's recognitions from the database."""
+        solutions = frozenset(get_solutions(self.n).codes())
+        recognized = get_recognitions(self.n)
+        with self._lock:
+            self.solutions = solutions
+            self.recognized = recognized
+
+    def recognize(self, board, player_name):
+        """Recognize board for player_name; same (success, message) contract as recognize_solution."""
+        if len(board) != self.n or any(col < 0 or col >= self.n for col in board):
+            return False, "Solution not found."
+        code = encode_board(board)
+        if code not in self.solutions:
+            return False, "Solution not found."
+        with self._lock:
+            if code in self.recognized:
+                return False, "Solution already recognized."
+            self.recognized[code] = player_name
+            self._pending.append((tuple(board), player_name))
+        return True, "Solution recognized!"
+
+    def all_recognized(self):
+        return len(self.recognized) == len(self.solutions)
+
+    def flush(self):
+        """Write queued recognitions to the database. Returns how many were written."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if pending:
+                recognize_solutions(pending)
+            return len(pending)
+
+    def reset(self):
+        """Start over: forget every recognition in memory and start a new round in the database.
+
+        Recognitions still queued are written to the round they were made in first.
+        """
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                self.recognized = {}
+            if pending:
+                recognize_solutions(pending)
+            reset_solutions()
@@ -1,9 +1,17 @@
+import os
 import time
+import queue
+import random
 import threading
-from database import save_solution, record_time
-import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from database import save_solutions, record_time
+from utils import canonical_form
+from instrumentation import SearchStats
 
 solutions = []
+worker_times = {}
+CANCEL_CHECK = 4096  # exhausted rows between checks of a cancel event
+THREAD_BUFFER = 1024  # boards iter_solutions_threaded's threads may run ahead of the consumer
 
 def is_safe(board, row, col):
     for i in range(row):
@@ -13,45 +21,589 @@ def is_safe(board, row, col):
             return False
     return True
 
-def solve_sequential():
+def solve_bitboard(n=8, stats=None):
+    """Return every solution for an n x n board as tuples of column indices."""
+    return list(iter_solutions(n, stats=stats))
+
+def _prefix_masks(n, prefix):
+    """Return the (cols, left, right) masks after placing prefix in the top rows."""
+    mask = (1 << n) - 1
+    cols = left = right = 0
+    for col in prefix:
+        bit = 1 << col
+        cols |= bit
+        left = ((left | bit) << 1) & mask
+        right = (right | bit) >> 1
+    return cols, left, right
+
+def iter_solutions(n=8, limit=None, prefix=(), stats=None, cancel=None):
+    """Yield solutions one at a time, in the same order as solve_bitboard.
+
+    The search is iterative (an explicit per-row stack of free-column masks),
+    so it never hits the recursion limit. Stops after limit solutions if
+    given. prefix fixes a conflict-free placement of the first rows. Pass a
+    SearchStats as stats to collect search counters. cancel is a
+    threading.Event checked every CANCEL_CHECK exhausted rows; once it is
+    set the search stops, even between two solutions.
+    """
+    start = len(prefix)
+    if n <= 0 or limit == 0 or start > n:
+        return
+    board = list(prefix) + [0] * (n - start)
+    if start == n:
+        yield tuple(board)
+        return
+    if stats is not None:
+        yield from _iter_instrumented(n, limit, prefix, stats, cancel)
+        return
+
+    mask = (1 << n) - 1
+    cols = [0] * n
+    left = [0] * n
+    right = [0] * n
+    free = [0] * n
+    cols[start], left[start], right[start] = _prefix_masks(n, prefix)
+    free[start] = ~(cols[start] | left[start] | right[start]) & mask
+    last = n - 1
+    found = 0
+    checks = CANCEL_CHECK
+    row = start
+    while row >= start:
+        candidates = free[row]
+        if not candidates:
+            row -= 1
+            if cancel is not None:
+                checks -= 1
+                if not checks:
+                    if cancel.is_set():
+                        return
+                    checks = CANCEL_CHECK
+            continue
+        bit = candidates & -candidates  # lowest free column
+        free[row] = candidates ^ bit
+        board[row] = bit.bit_length() - 1
+        if row == last:
+            yield tuple(board)
+            found += 1
+            if limit is not None and found >= limit:
+                return
+            continue
+        c = cols[row] | bit
+        l = ((left[row] | bit) << 1) & mask
+        r = (right[row] | bit) >> 1
+        row += 1
+        cols[row], left[row], right[row] = c, l, r
+        free[row] = ~(c | l | r) & mask
+
+def _iter_instrumented(n, limit, prefix, stats, cancel=None):
+    """The iter_solutions loop with every SearchStats counter updated as it goes.
+
+    Kept separate from the plain loop so that uninstrumented searches pay
+    nothing for it. Subtree times are wall-clock, keyed by the first row's
+    column, and include the time the consumer spends between yields. The
+    prefix rows are not counted here; see _credit_prefixes.
+    """
+    started = time.perf_counter()
+    start = len(prefix)
+    board = list(prefix) + [0] * (n - start)
+    mask = (1 << n) - 1
+    cols = [0] * n
+    left = [0] * n
+    right = [0] * n
+    free = [0] * n
+    cols[start], left[start], right[start] = _prefix_masks(n, prefix)
+    free[start] = ~(cols[start] | left[start] | right[start]) & mask
+    stats.prunes += n - bin(free[start]).count("1")
+    last = n - 1
+    found = 0
+    checks = CANCEL_CHECK
+    row = start
+    subtree = None
+    subtree_start = started
+    try:
+        while row >= start:
+            candidates = free[row]
+            if not candidates:
+                row -= 1
+                if cancel is not None:
+                    checks -= 1
+                    if not checks:
+                        if cancel.is_set():
+                            return
+                        checks = CANCEL_CHECK
+                continue
+            bit = candidates & -candidates
+            free[row] = candidates ^ bit
+            board[row] = bit.bit_length() - 1
+            stats.nodes += 1
+            stats.depth_nodes[row] += 1
+            if row == start:
+                now = time.perf_counter()
+                if subtree is not None:
+                    stats.subtree_time[subtree] = stats.subtree_time.get(subtree, 0.0) + now - subtree_start
+                subtree, subtree_start = board[0], now
+            if row == last:
+                stats.solutions += 1
+                yield tuple(board)
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+                continue
+            c = cols[row] | bit
+            l = ((left[row] | bit) << 1) & mask
+            r = (right[row] | bit) >> 1
+            row += 1
+            cols[row], left[row], right[row] = c, l, r
+            free[row] = ~(c | l | r) & mask
+            stats.prunes += n - bin(free[row]).count("1")
+    finally:
+        now = time.perf_counter()
+        if subtree is not None:
+            stats.subtree_time[subtree] = stats.subtree_time.get(subtree, 0.0) + now - subtree_start
+        stats.elapsed += now - started
+
+def _prefixes(n, depth):
+    """List every conflict-free placement of the first depth rows, in order."""
+    depth = min(depth, n)
+    mask = (1 << n) - 1
+    found = []
+
+    def extend(prefix, cols, left, right):
+        if len(prefix) == depth:
+            found.append(tuple(prefix))
+            return
+        free = ~(cols | left | right) & mask
+        while free:
+            bit = free & -free
+            free ^= bit
+            extend(prefix + [bit.bit_length() - 1], cols | bit,
+                   ((left | bit) << 1) & mask, (right | bit) >> 1)
+
+    extend([], 0, 0, 0)
+    return found
+
+def _credit_prefixes(n, prefixes, stats):
+    """Add the counters of the rows above prefixes to stats.
+
+    Prefix-partitioned searches only count what lies below each prefix. This
+    walks the top rows once, crediting the prefixes, their ancestors and any
+    branch that dies out before prefix depth, so the merged totals match a
+    search started at row 0 over the same subtrees.
+    """
+    if not prefixes or not prefixes[0]:
+        return
+    depth = len(prefixes[0])
+    covered = {prefix[:row] for prefix in prefixes for row in range(depth + 1)}
+    mask = (1 << n) - 1
+
+    def expand(path, cols, left, right, into):
+        # Returns how many placements of depth rows lie below path
+        row = len(path)
+        free = ~(cols | left | right) & mask
+        into.prunes += n - bin(free).count("1")
+        reached = 0
+        while free:
+            bit = free & -free
+            free ^= bit
+            child = path + (bit.bit_length() - 1,)
+            counter = into if child in covered else SearchStats(n)
+            counter.nodes += 1
+            counter.depth_nodes[row] += 1
+            if row + 1 == depth:
+                found = 1
+                if depth == n:
+                    counter.solutions += 1
+            else:
+                found = expand(child, cols | bit, ((left | bit) << 1) & mask, (right | bit) >> 1, counter)
+            if counter is not into and not found:
+                into.merge(counter)  # A dead end above prefix depth is visited by the search too
+            reached += found
+        return reached
+
+    expand((), 0, 0, 0, stats)
+
+def _symmetric_prefixes(n, depth=1):
+    """Prefixes covering one mirror half of the tree: first queen left of centre,
+    or on the centre column (odd n) with the second queen left of centre."""
+    mid = n // 2
+    if n % 2:
+        depth = max(depth, 2)
+    return [p for p in _prefixes(n, depth)
+            if p[0] < mid or (n % 2 and p[0] == mid and (len(p) == 1 or p[1] < mid))]
+
+def _count_below(n, prefix, cancel=None):
+    """Count the solutions extending prefix without building any boards.
+
+    Returns None if cancel (a threading.Event, checked every CANCEL_CHECK
+    exhausted rows) is set before the count is finished.
+    """
+    start = len(prefix)
+    if start >= n:
+        return 1 if start == n else 0
+    mask = (1 << n) - 1
+    cols = [0] * n
+    left = [0] * n
+    right = [0] * n
+    free = [0] * n
+    cols[start], left[start], right[start] = _prefix_masks(n, prefix)
+    free[start] = ~(cols[start] | left[start] | right[start]) & mask
+    last = n - 1
+    if start == last:
+        return bin(free[start]).count("1")
+    total = 0
+    checks = CANCEL_CHECK
+    row = start
+    while row >= start:
+        candidates = free[row]
+        if not candidates:
+            row -= 1
+            if cancel is not None:
+                checks -= 1
+                if not checks:
+                    if cancel.is_set():
+                        return None
+                    checks = CANCEL_CHECK
+            continue
+        bit = candidates & -candidates
+        free[row] = candidates ^ bit
+        c = cols[row] | bit
+        l = ((left[row] | bit) << 1) & mask
+        r = (right[row] | bit) >> 1
+        following = ~(c | l | r) & mask
+        if row + 1 == last:
+            total += bin(following).count("1")  # every free square in the last row completes a board
+            continue
+        row += 1
+        cols[row], left[row], right[row] = c, l, r
+        free[row] = following
+    return total
+
+def _count_prefix(n, prefix, instrument=False):
+    """Worker task: count the subtree below prefix in a separate process.
+
+    Returns (count, seconds, pid, stats dict or None).
+    """
+    start_time = time.perf_counter()
+    if instrument:
+        stats = SearchStats(n)
+        count = sum(1 for _ in iter_solutions(n, prefix=prefix, stats=stats))
+        return count, time.perf_counter() - start_time, os.getpid(), stats.as_dict()
+    count = _count_below(n, prefix)
+    return count, time.perf_counter() - start_time, os.getpid(), None
+
+def _solve_prefix(n, prefix, instrument=False):
+    """Worker task: solve the subtree below prefix in a separate process.
+
+    Returns (solutions, seconds, pid, stats dict or None).
+    """
+    start_time = time.perf_counter()
+    stats = SearchStats(n) if instrument else None
+    found = list(iter_solutions(n, prefix=prefix, stats=stats))
+    return found, time.perf_counter() - start_time, os.getpid(), stats and stats.as_dict()
+
+def solve_sequential(n=8, stats=None):
     global solutions
     solutions = []
     start_time = time.time()
-    def solve(row=0, board=[]):
-        if row == 8:
-            solutions.append(tuple(board))
-            save_solution(str(board))
-            return
-        for col in range(8):
-            if is_safe(board, row, col):
-                solve(row + 1, board + [col])
-    solve()
+    solutions = solve_bitboard(n, stats=stats)
+    save_solutions(solutions)
     end_time = time.time()
-    record_time("sequential", end_time - start_time)
+    record_time("sequential", end_time - start_time, n=n, solutions=len(solutions),
+                stats=stats and stats.as_dict())
     return solutions  # Return the solutions list
 
-def solve_threaded():
+def solve_streaming(n=8, limit=None, chunk_size=1000):
+    """Stream solutions straight into the database without keeping them in memory.
+
+    Returns the number of solutions found.
+    """
+    start_time = time.time()
+    found = 0
+
+    def counted():
+        nonlocal found
+        for board in iter_solutions(n, limit=limit):
+            found += 1
+            yield board
+
+    save_solutions(counted(), chunk_size=chunk_size)
+    end_time = time.time()
+    record_time("streaming", end_time - start_time, n=n, options={"limit": limit} if limit else None,
+                solutions=found)
+    return found
+
+def solve_threaded(n=8, persist=True, stats=None):
     global solutions
     solutions = []
     start_time = time.time()
     threads = []
+    results = [[] for _ in range(n)]
+    thread_stats = [SearchStats(n) if stats is not None else None for _ in range(n)]
 
-    def solve(row=0, board=[]):
-        if row == 8:
-            solutions.append(tuple(board))
-            save_solution(str(board))
-            return
-        for col in range(8):
-            if is_safe(board, row, col):
-                solve(row + 1, board + [col])
+    def solve(col):
+        results[col].extend(iter_solutions(n, prefix=(col,), stats=thread_stats[col]))
 
-    for col in range(8):
-        t = threading.Thread(target=solve, args=(1, [col]))
+    for col in range(n):
+        t = threading.Thread(target=solve, args=(col,))
         threads.append(t)
         t.start()
 
     for t in threads:
         t.join()
 
-    end_time = time.time()
-    record_time("threaded", end_time - start_time)
+    for found in results:
+        solutions.extend(found)
+    if stats is not None:
+        _credit_prefixes(n, [(col,) for col in range(n)], stats)
+        for col, counters in enumerate(thread_stats):
+            stats.merge(counters, worker=f"thread-{col}")
+    if persist:
+        save_solutions(solutions)
+        record_time("threaded", time.time() - start_time, n=n, solutions=len(solutions),
+                    stats=stats and stats.as_dict())
+    return solutions
+
+def iter_solutions_threaded(n=8, cancel=None, thread_stats=None, buffer=THREAD_BUFFER):
+    """Yield solutions as they are found by one thread per first-row column.
+
+    Boards arrive in no particular order. The threads run at most buffer
+    boards ahead of the consumer. Setting cancel, or closing the generator,
+    stops every thread within one CANCEL_CHECK batch. thread_stats, a list
+    of n SearchStats, is updated live, one per first-row column.
+    """
+    if n <= 0:
+        return
+    found = queue.Queue(maxsize=buffer)
+    stop = threading.Event()
+    finished = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                found.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def solve(col):
+        try:
+            stats = thread_stats[col] if thread_stats is not None else None
+            for board in iter_solutions(n, prefix=(col,), stats=stats, cancel=stop):
+                if not put(board):
+                    return
+        finally:
+            put(finished)
+
+    threads = [threading.Thread(target=solve, args=(col,), daemon=True) for col in range(n)]
+    for t in threads:
+        t.start()
+    try:
+        running = n
+        while running:
+            if cancel is not None and cancel.is_set():
+                return
+            try:
+                board = found.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if board is finished:
+                running -= 1
+            else:
+                yield board
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+
+def solve_parallel(n=8, workers=None, prefix_depth=2, persist=True, stats=None):
+    """Split the search tree by its first prefix_depth rows across processes.
+
+    Results are merged in prefix order, so the solution list matches
+    solve_sequential. Per-worker timing is left in worker_times, keyed by pid.
+    persist=False skips the database write and timing record (used by benchmarks).
+    A SearchStats passed as stats collects the counters of every task, per worker.
+    """
+    global solutions
+    solutions = []
+    worker_times.clear()
+    start_time = time.time()
+    prefixes = _prefixes(n, prefix_depth) if n > 0 else []
+
+    instrument = [stats is not None] * len(prefixes)
+    if stats is not None:
+        _credit_prefixes(n, prefixes, stats)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_solve_prefix, [n] * len(prefixes), prefixes, instrument)
+        for found, elapsed, pid, task_stats in results:
+            solutions.extend(found)
+            timing = worker_times.setdefault(pid, {"tasks": 0, "time": 0.0})
+            timing["tasks"] += 1
+            timing["time"] += elapsed
+            if task_stats:
+                stats.merge(task_stats, worker=pid)
+
+    if persist:
+        save_solutions(solutions)
+        record_time("parallel", time.time() - start_time, n=n,
+                    options={"workers": workers, "prefix_depth": prefix_depth},
+                    solutions=len(solutions), stats=stats and stats.as_dict())
+    return solutions
+
+def solve_symmetric(n=8, canonical_only=False, persist=True, stats=None):
+    """Search only the left half of the first row and mirror the results.
+
+    For odd n the centre column of the first row is searched with the second
+    row restricted to its left half. With canonical_only, return just one
+    representative per rotation/reflection class (12 for n=8). Without it,
+    a SearchStats passed as stats counts the mirrored boards as solutions
+    too, while its node and prune counters cover the searched half.
+    """
+    global solutions
+    solutions = []
+    start_time = time.time()
+    half = []
+    prefixes = _symmetric_prefixes(n) if n > 0 else []
+    if stats is not None:
+        _credit_prefixes(n, prefixes, stats)
+    for prefix in prefixes:
+        half.extend(iter_solutions(n, prefix=prefix, stats=stats))
+
+    if canonical_only:
+        solutions = [board for board in half if board == canonical_form(board)]
+    elif n > 1:
+        solutions = half + [tuple(n - 1 - col for col in board) for board in half]
+        if stats is not None:
+            stats.solutions += len(half)  # The mirrored boards; the other counters cover the searched half
+    else:
+        solutions = half  # the single 1x1 board is its own mirror image
+    solutions.sort()
+
+    if persist:
+        save_solutions(solutions)
+        record_time("symmetric", time.time() - start_time, n=n,
+                    options={"canonical_only": canonical_only}, solutions=len(solutions),
+                    stats=stats and stats.as_dict())
+    return solutions
+
+def count_solutions(n=8, parallel=False, symmetric=False, workers=None, prefix_depth=2,
+                    persist=True, stats=None):
+    """Count the solutions for an n x n board without materializing them.
+
+    symmetric counts one mirror half and doubles it; parallel spreads the
+    prefix subtrees over a process pool (filling worker_times). Nothing is
+    written to the solutions table; the elapsed time is recorded as "count"
+    unless persist is False. Passing a SearchStats as stats switches to the
+    instrumented search, which visits every leaf instead of popcounting the
+    last row. With symmetric, its solution counter includes the mirror half
+    like the returned total, while the node and prune counters cover only
+    the half that was searched.
+    """
+    start_time = time.time()
+    if n <= 0:
+        prefixes = []
+    elif symmetric:
+        prefixes = _symmetric_prefixes(n, prefix_depth if parallel else 1)
+    else:
+        prefixes = _prefixes(n, prefix_depth if parallel else 0)
+    if stats is not None:
+        _credit_prefixes(n, prefixes, stats)
+
+    if parallel:
+        worker_times.clear()
+        total = 0
+        instrument = [stats is not None] * len(prefixes)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_count_prefix, [n] * len(prefixes), prefixes, instrument)
+            for count, elapsed, pid, task_stats in results:
+                total += count
+                timing = worker_times.setdefault(pid, {"tasks": 0, "time": 0.0})
+                timing["tasks"] += 1
+                timing["time"] += elapsed
+                if task_stats:
+                    stats.merge(task_stats, worker=pid)
+    elif stats is not None:
+        total = sum(1 for prefix in prefixes for _ in iter_solutions(n, prefix=prefix, stats=stats))
+    else:
+        total = sum(_count_below(n, prefix) for prefix in prefixes)
+
+    if symmetric and n > 1:
+        if stats is not None:
+            stats.solutions += total  # The mirrored half; the other counters cover the searched half
+        total *= 2
+    if persist:
+        record_time("count", time.time() - start_time, n=n,
+                    options={"parallel": parallel, "symmetric": symmetric, "workers": workers},
+                    solutions=total, stats=stats and stats.as_dict())
+    return total
+
+def solve_min_conflicts(n=8, seed=None, max_steps=None):
+    """Find one solution by heuristic repair; practical for n up to about 10**6.
+
+    Queens start as a random permutation (so columns never clash), placed row
+    by row on a diagonal-free column when a few random tries find one. Rows
+    still in conflict are then repaired by swapping columns with random rows
+    whenever that lowers the conflict count, using array-backed diagonal
+    counts. The search restarts after max_steps repairs (default 100 * n).
+    The same seed always gives the same board.
+    """
+    if n in (2, 3):
+        raise ValueError(f"No solution exists for n={n}")
+    if n <= 1:
+        return tuple(range(n))
+    rng = random.Random(seed)
+    randrange = rng.randrange
+    offset = n - 1
+    max_steps = max_steps or 100 * n
+    while True:
+        board = list(range(n))
+        diag = [0] * (2 * n - 1)  # indexed by row - col + n - 1
+        anti = [0] * (2 * n - 1)  # indexed by row + col
+        for row in range(n):
+            for _ in range(64):
+                j = randrange(row, n)
+                col = board[j]
+                if not diag[row - col + offset] and not anti[row + col]:
+                    break
+            board[row], board[j] = col, board[row]
+            diag[row - col + offset] += 1
+            anti[row + col] += 1
+
+        # Every line holding two or more queens keeps at least one of them in pending
+        pending = [row for row in range(n)
+                   if diag[row - board[row] + offset] > 1 or anti[row + board[row]] > 1]
+        steps = 0
+        while pending and steps < max_steps:
+            i = pending.pop()
+            ci = board[i]
+            if diag[i - ci + offset] == 1 and anti[i + ci] == 1:
+                continue
+            steps += 1
+            j = randrange(n)
+            cj = board[j]
+            if j == i:
+                pending.append(i)
+                continue
+            # Take both queens off, then compare their current and swapped squares
+            diag[i - ci + offset] -= 1
+            anti[i + ci] -= 1
+            diag[j - cj + offset] -= 1
+            anti[j + cj] -= 1
+            before = (diag[i - ci + offset] + anti[i + ci] + diag[j - cj + offset] + anti[j + cj]
+                      + (i - ci == j - cj) + (i + ci == j + cj))
+            after = (diag[i - cj + offset] + anti[i + cj] + diag[j - ci + offset] + anti[j + ci]
+                     + (i - cj == j - ci) + (i + cj == j + ci))
+            if after < before:
+                ci, cj = cj, ci
+                board[i], board[j] = ci, cj
+            diag[i - ci + offset] += 1
+            anti[i + ci] += 1
+            diag[j - cj + offset] += 1
+            anti[j + cj] += 1
+            for row in (i, j):
+                col = board[row]
+                if diag[row - col + offset] > 1 or anti[row + col] > 1:
+                    pending.append(row)
+        if not pending:
+            return tuple(board)
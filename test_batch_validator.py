@@ -0,0 +1,40 @@
+import unittest
+import itertools
+from solver import solve_bitboard
+from utils import encode_board
+
+try:
+    import numpy as np
+    from batch_validator import validate_boards, encode_boards
+except ImportError:
+    np = None
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchValidator(unittest.TestCase):
+    def test_all_permutations_of_six(self):
+        boards = np.array(list(itertools.permutations(range(6))))
+        valid, conflicts = validate_boards(boards, chunk_size=100)
+        found = {tuple(board) for board in boards[valid]}
+        self.assertEqual(found, set(solve_bitboard(6)))
+        self.assertTrue((conflicts[~valid] > 0).all())
+
+    def test_conflict_counts(self):
+        boards = np.array([
+            [0, 4, 7, 5, 2, 6, 1, 3],  # Solution
+            [0, 1, 2, 3, 4, 5, 6, 7],  # All on one diagonal: 28 pairs
+            [0, 0, 7, 5, 2, 6, 1, 3],  # Same column
+            [0, 4, 7, 5, 2, 6, 1, 8],  # Off the board
+        ])
+        valid, conflicts = validate_boards(boards)
+        self.assertEqual(valid.tolist(), [True, False, False, False])
+        self.assertEqual(conflicts[1], 28)
+        self.assertGreaterEqual(conflicts[2], 1)
+
+    def test_encode_matches_utils(self):
+        boards = np.array(solve_bitboard(8))
+        self.assertEqual(encode_boards(boards).tolist(), [encode_board(b) for b in solve_bitboard(8)])
+        with self.assertRaises(ValueError):
+            encode_boards(np.array([[8, 0, 0, 0, 0, 0, 0, 0]]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import contextlib
+import csv
+import io
+import os
+import subprocess
+import sys
+from unittest import mock
+import database
+from cli import main, read_frames
+from solver import solve_bitboard
+from test_support import use_scratch_dir, database_at
+
+
+class TestCommandLine(unittest.TestCase):
+    def setUp(self):
+        self.scratch = use_scratch_dir(self)
+        self.saved_db = database.DB_NAME
+
+    def path(self, name):
+        return os.path.join(self.scratch, name)
+
+    def run_cli(self, *argv):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertEqual(main(list(argv)), 0)
+        return err.getvalue()
+
+    def test_solve_to_csv_reports_throughput(self):
+        report = self.run_cli("solve", "--sizes", "6-8", "--csv", self.path("out.csv"))
+        with open(self.path("out.csv"), newline="") as f:
+            rows = list(csv.reader(f))[1:]
+        self.assertEqual(len(rows), 4 + 40 + 92)
+        self.assertIn(["8", "0,4,7,5,2,6,1,3"], rows)
+        self.assertEqual(len(report.splitlines()), 3)
+        self.assertIn("solutions=92", report)
+        self.assertIn("rate=", report)
+
+    def test_binary_round_trip_through_database(self):
+        self.run_cli("solve", "--engine", "parallel", "--workers", "2", "--sizes", "8",
+                     "--binary", self.path("n8.bin"))
+        with open(self.path("n8.bin"), "rb") as f:
+            frames = list(read_frames(f))
+        self.assertEqual(sorted(board for _, boards in frames for board in boards),
+                         sorted(solve_bitboard(8)))
+
+        self.run_cli("load", "--db", self.path("copy.db"), "--binary", self.path("n8.bin"))
+        self.run_cli("export", "--db", self.path("copy.db"), "--binary", self.path("again.bin"))
+        with open(self.path("again.bin"), "rb") as f:
+            self.assertEqual([(n, len(boards)) for n, boards in read_frames(f)], [(8, 92)])
+        self.assertEqual(database.DB_NAME, self.saved_db)
+
+    def test_solve_into_database_records_runs(self):
+        self.run_cli("solve", "--engine", "symmetric", "--sizes", "5-6", "--db", self.path("s.db"))
+        self.run_cli("solve", "--sizes", "9", "--count-only", "--db", self.path("s.db"))
+        with database_at(self.path("s.db")):
+            stored = database.get_stored_solutions()
+            self.assertEqual(len(stored), 10 + 4)
+            self.assertEqual(database.get_run_history("cli-sequential")[0]["solutions"], 352)
+
+    def test_export_reports_once_per_size(self):
+        self.run_cli("solve", "--sizes", "8-9", "--db", self.path("e.db"))
+        with mock.patch("cli.CHUNK_SIZE", 100):
+            report = self.run_cli("export", "--db", self.path("e.db"), "--csv", self.path("e.csv"))
+        lines = report.splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn("export n=8 solutions=92 ", lines[0])
+        self.assertIn("export n=9 solutions=352 ", lines[1])
+
+    def test_closed_stdout_exits_quietly(self):
+        self.run_cli("solve", "--sizes", "9-11", "--db", self.path("p.db"))
+        cli = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+        process = subprocess.Popen([sys.executable, cli, "export", "--db", self.path("p.db"), "--csv", "-"],
+                                   stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        process.stdout.readline()
+        process.stdout.close()
+        stderr = process.stderr.read().decode()
+        process.stderr.close()
+        self.assertEqual(process.wait(), 1)
+        self.assertNotIn("Traceback", stderr)
+
+    def test_load_rejects_non_solutions(self):
+        with open(self.path("mixed.csv"), "w", newline="") as f:
+            csv.writer(f).writerows([
+                ["n", "board"],
+                ["4", "1,3,0,2"],
+                ["4", "5,2,0,2"],  # Off the board; would alias 1,3,0,2
+                ["4", "0,1,2,3"],  # Conflicts
+                ["8", "1,3,0,2"],  # Wrong size
+                ["4", "x"],
+            ])
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            self.assertEqual(main(["load", "--db", self.path("l.db"), "--csv", self.path("mixed.csv")]), 1)
+        self.assertIn("loaded 1 solutions, 1 new, 4 rejected", err.getvalue())
+        self.assertIn("rejected (5, 2, 0, 2)", err.getvalue())
+
+    def test_rejects_count_only_file_output(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["solve", "--count-only", "--csv", self.path("counts.csv")])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,15 @@
 import unittest
 import os
-from database import init_db, save_solution, get_stored_solutions, recognize_solution, reset_solutions
+import sqlite3
+import threading
+from database import (
+    init_db, save_solution, save_solutions, get_stored_solutions, recognize_solution, reset_solutions,
+    get_connection, close_connection, close_connections, get_solutions_page, recognize_solutions_bulk,
+    all_solutions_recognized, count_unrecognized, current_round, get_rounds, get_round_progress
+)
+from solver import iter_solutions
+from utils import encode_board
+
 
 class TestDatabaseOperations(unittest.TestCase):
     def setUp(self):
@@ -11,7 +20,15 @@ class TestDatabaseOperations(unittest.TestCase):
         sample_solution = "0,4,7,5,2,6,1,3"
         save_solution(sample_solution)
         solutions = get_stored_solutions()
-        self.assertIn((sample_solution, None, 0), solutions)
+        self.assertIn(((0, 4, 7, 5, 2, 6, 1, 3), None, 0), solutions)
+
+    def test_off_board_solution_is_rejected(self):
+        save_solution((1, 3, 0, 2))
+        with self.assertRaises(ValueError):
+            save_solution("5,2,0,2")
+        with self.assertRaises(ValueError):
+            recognize_solution((5, 2, 0, 2), "Mallory")
+        self.assertNotIn(((1, 3, 0, 2), "Mallory", 1), get_stored_solutions())
 
     def test_recognize_solution(self):
         solution = "1,3,5,7,2,0,6,4"
@@ -20,13 +37,213 @@ class TestDatabaseOperations(unittest.TestCase):
         self.assertTrue(success)
         self.assertEqual(msg, "Solution recognized!")
 
+    def test_concurrent_recognition_has_one_winner(self):
+        solution = "3,1,6,2,5,7,4,0"
+        save_solution(solution)
+        results = []
+        barrier = threading.Barrier(8)
+
+        def submit(i):
+            barrier.wait()
+            results.append(recognize_solution(solution, f"Player{i}"))
+
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sum(success for success, _ in results), 1)
+        self.assertEqual(recognize_solution("0,1,2,3,4,5,6,7", "Nobody"), (False, "Solution not found."))
+
     def test_duplicate_solution(self):
         solution = "2,4,6,0,3,1,7,5"
         save_solution(solution)
         save_solution(solution)  # Should be ignored
+        save_solution(str([2, 4, 6, 0, 3, 1, 7, 5]))  # Same board, other text format
         solutions = get_stored_solutions()
-        matches = [s for s in solutions if s[0] == solution]
+        matches = [s for s in solutions if s[0] == (2, 4, 6, 0, 3, 1, 7, 5)]
         self.assertEqual(len(matches), 1)
 
+    def test_bulk_save_solutions(self):
+        batch = [(i // 10, i % 10, 0, 0, 0, 0, 0, 0, 0, 0) for i in range(25)]
+        save_solutions(iter(batch), chunk_size=10)
+        save_solutions(batch, chunk_size=7)  # Duplicates should be ignored
+        stored = [s[0] for s in get_stored_solutions()]
+        for solution in batch:
+            self.assertEqual(stored.count(solution), 1)
+
+    def test_failed_bulk_save_rolls_back(self):
+        def boards():
+            yield (1, 3, 0, 2)
+            yield (2, 0, 3, 1)
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            save_solutions(boards(), chunk_size=1)
+        self.assertFalse(get_connection().in_transaction)
+        self.assertNotIn((1, 3, 0, 2), [s[0] for s in get_stored_solutions()])
+
+    def test_connection_reused_per_thread(self):
+        conn = get_connection()
+        self.assertIs(get_connection(), conn)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+
+        other = []
+        worker = threading.Thread(target=lambda: other.append(get_connection()))
+        worker.start()
+        worker.join()
+        self.assertIsNot(other[0], conn)
+
+        close_connections()
+        self.assertIsNot(get_connection(), conn)
+
+    def test_close_connection_leaves_other_threads(self):
+        conn = get_connection()
+        other = []
+
+        def open_and_close():
+            other.append(get_connection())
+            close_connection()
+        worker = threading.Thread(target=open_and_close)
+        worker.start()
+        worker.join()
+        self.assertEqual(conn.execute("SELECT 1").fetchone(), (1,))
+        self.assertIs(get_connection(), conn)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            other[0].execute("SELECT 1")
+
+    def test_concurrent_writers(self):
+        def write(worker):
+            save_solutions((worker, i % 8, i // 8, 0, 0, 0, 0, 0) for i in range(50))
+        threads = [threading.Thread(target=write, args=(w,)) for w in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        stored = {s[0] for s in get_stored_solutions()}
+        for w in range(8):
+            self.assertIn((w, 1, 6, 0, 0, 0, 0, 0), stored)
+
+    def test_migrates_recognized_flags(self):
+        conn = get_connection()
+        conn.execute("DROP TABLE solutions")
+        conn.execute("CREATE TABLE solutions (n INTEGER NOT NULL, code INTEGER NOT NULL, "
+                     "recognized_by TEXT, recognized INTEGER DEFAULT 0, PRIMARY KEY (n, code)) WITHOUT ROWID")
+        conn.executemany("INSERT INTO solutions VALUES (?, ?, ?, ?)",
+                         [(4, encode_board((1, 3, 0, 2)), "Alice", 1),
+                          (4, encode_board((2, 0, 3, 1)), None, 0)])
+        conn.commit()
+        init_db()
+        solutions = get_stored_solutions()
+        self.assertIn(((1, 3, 0, 2), "Alice", 1), solutions)
+        self.assertIn(((2, 0, 3, 1), None, 0), solutions)
+        self.assertEqual(get_round_progress()[4], (1, 2))
+
+    def test_rounds_keep_counters_and_history(self):
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM solutions")
+        boards = [(0, 4, 7, 5, 2, 6, 1, 3), (1, 3, 5, 7, 2, 0, 6, 4)]
+        save_solutions(boards)
+        save_solutions(boards)  # Ignored rows are not counted twice
+        self.assertEqual(count_unrecognized(), {8: 2})
+        recognize_solution(boards[0], "Alice")
+        recognize_solution(boards[0], "Bob")
+        self.assertEqual(get_round_progress()[8], (1, 2))
+        recognize_solution(boards[1], "Bob")
+        self.assertTrue(all_solutions_recognized())
+
+        first = current_round()
+        reset_solutions()
+        self.assertEqual(current_round(), first + 1)
+        self.assertEqual(get_round_progress()[8], (0, 2))
+        self.assertFalse(all_solutions_recognized())
+        self.assertTrue(recognize_solution(boards[0], "Carol")[0])
+
+        self.assertEqual(get_round_progress(first)[8], (2, 2))
+        self.assertIn((boards[0], "Alice", 1), get_stored_solutions(first))
+        self.assertEqual(get_solutions_page(player="carol")[0], [(boards[0], "Carol", 1)])
+        self.assertEqual(get_solutions_page(player="alice", round_id=first)[0], [(boards[0], "Alice", 1)])
+        history = {r["round"]: r for r in get_rounds()}
+        self.assertIsNotNone(history[first]["ended_at"])
+        self.assertIsNone(history[first + 1]["ended_at"])
+
+        with conn:
+            conn.execute("DELETE FROM solutions WHERE code = ?", (encode_board(boards[0]),))
+        self.assertEqual(get_round_progress()[8], (0, 1))
+
+    def test_migrates_text_solutions(self):
+        conn = get_connection()
+        conn.execute("DROP TABLE solutions")
+        conn.execute("CREATE TABLE solutions (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                     "solution TEXT UNIQUE, recognized_by TEXT, recognized INTEGER DEFAULT 0)")
+        conn.executemany("INSERT INTO solutions (solution, recognized_by, recognized) VALUES (?, ?, ?)",
+                         [("0,4,7,5,2,6,1,3", None, 0),
+                          ("[0, 4, 7, 5, 2, 6, 1, 3]", "Alice", 1),
+                          ("[1, 3, 0, 2]", None, 0)])
+        conn.commit()
+        init_db()
+        solutions = get_stored_solutions()
+        self.assertIn(((0, 4, 7, 5, 2, 6, 1, 3), "Alice", 1), solutions)
+        self.assertIn(((1, 3, 0, 2), None, 0), solutions)
+        self.assertEqual(len(solutions), 2)
+
+    def test_solutions_paging_and_filters(self):
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM solutions")
+        boards = [(a, b, c, 0) for a in range(4) for b in range(4) for c in range(4)]
+        save_solutions(boards)
+        recognize_solution(boards[5], "Alice")
+        recognize_solution(boards[40], "Bob")
+
+        seen = []
+        page, cursor = get_solutions_page(limit=10)
+        seen.extend(page)
+        while cursor is not None:
+            page, cursor = get_solutions_page(after=cursor, limit=10)
+            self.assertLessEqual(len(page), 10)
+            seen.extend(page)
+        self.assertEqual(sorted(row[0] for row in seen), sorted(boards))
+
+        page, cursor = get_solutions_page(recognized=True)
+        self.assertEqual({row[1] for row in page}, {"Alice", "Bob"})
+        self.assertIsNone(cursor)
+        page, _ = get_solutions_page(player="ali")
+        self.assertEqual(page, [(boards[5], "Alice", 1)])
+        self.assertEqual(len(get_solutions_page(recognized=False, limit=100)[0]), 62)
+        self.assertEqual(get_solutions_page(n=8)[0], [])
+
+    def test_bulk_recognition(self):
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM solutions")
+        boards = [(0, 4, 7, 5, 2, 6, 1, 3), (1, 3, 5, 7, 2, 0, 6, 4), (2, 4, 6, 0, 3, 1, 7, 5)]
+        save_solutions(boards[:2])
+        recognize_solution(boards[1], "Earlier")
+        codes = [encode_board(b) for b in boards] + [encode_board(boards[0])]
+        results = recognize_solutions_bulk(8, codes, "Auditor")
+        self.assertEqual(results, [
+            (True, "Solution recognized!"),
+            (False, "Solution already recognized."),
+            (False, "Solution not found."),
+            (False, "Solution already recognized."),  # Repeated within the batch
+        ])
+        stored = dict((s[0], s[1]) for s in get_stored_solutions())
+        self.assertEqual(stored[boards[0]], "Auditor")
+        self.assertEqual(stored[boards[1]], "Earlier")
+
+    def test_bulk_recognition_of_blob_codes(self):
+        boards = list(iter_solutions(16, limit=2))  # 64-bit codes, stored as BLOBs
+        save_solutions(boards[:1])
+        codes = [encode_board(b) for b in boards]
+        self.assertEqual(recognize_solutions_bulk(16, codes, "Auditor"),
+                         [(True, "Solution recognized!"), (False, "Solution not found.")])
+        self.assertEqual(recognize_solutions_bulk(16, codes[:1], "Auditor"),
+                         [(False, "Solution already recognized.")])
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM solutions WHERE n = 16")
+
 if __name__ == '__main__':
     unittest.main()
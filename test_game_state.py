@@ -0,0 +1,69 @@
+import unittest
+import itertools
+from game_state import BoardState
+from solver import is_safe
+
+def attacking_pairs(board):
+    queens = [(r, c) for r, c in enumerate(board) if c != -1]
+    return sum(1 for (r1, c1), (r2, c2) in itertools.combinations(queens, 2)
+               if c1 == c2 or abs(c1 - c2) == abs(r1 - r2))
+
+class TestBoardState(unittest.TestCase):
+    def test_solution_detected_incrementally(self):
+        state = BoardState(8)
+        for row, col in enumerate([0, 4, 7, 5, 2, 6, 1, 3]):
+            self.assertFalse(state.is_solution())
+            state.place(row, col)
+        self.assertTrue(state.is_solution())
+        self.assertIsNone(state.conflict_reason())
+        self.assertEqual(state.conflicting_queens(), set())
+
+    def test_counters_match_full_rescan(self):
+        state = BoardState(6)
+        moves = [(0, 1), (3, 1), (2, 3), (0, 4), (5, 0), (3, 5), (1, 2), (2, 3), (4, 4)]
+        for row, col in moves:
+            state.place(row, col)
+            self.assertEqual(state.conflicts, attacking_pairs(state.board))
+        state.remove(3)
+        state.remove(3)  # Removing an empty row is a no-op
+        self.assertEqual(state.conflicts, attacking_pairs(state.board))
+        state.clear()
+        self.assertEqual((state.placed, state.conflicts), (0, 0))
+        self.assertEqual(state.board, [-1] * 6)
+
+    def test_attacked_squares(self):
+        state = BoardState(8)
+        state.place(0, 0)
+        self.assertTrue(state.is_attacked(1, 0))
+        self.assertTrue(state.is_attacked(1, 1))
+        self.assertFalse(state.is_attacked(1, 2))
+        self.assertFalse(state.is_attacked(0, 0))  # A queen does not attack its own square
+        attacked = state.attacked_squares()
+        for col in range(8):
+            self.assertEqual((1, col) in attacked, not is_safe([0], 1, col))
+
+    def test_lines_through_cover_every_changed_square(self):
+        state = BoardState(8)
+        state.place(2, 5)
+        before = state.attacked_squares()
+        state.place(2, 1)
+        after = state.attacked_squares()
+        changed = before ^ after
+        self.assertTrue(changed)
+        self.assertLessEqual(changed, state.lines_through(2, 5) | state.lines_through(2, 1))
+
+    def test_conflict_reasons(self):
+        state = BoardState(4)
+        self.assertIn("every row", state.conflict_reason())
+        for row, col in enumerate([1, 1, 0, 2]):
+            state.place(row, col)
+        self.assertIn("columns", state.conflict_reason())
+        state.place(1, 3)
+        self.assertTrue(state.is_solution())
+        state.place(2, 2)
+        state.place(3, 0)
+        self.assertIn("diagonal", state.conflict_reason())
+        self.assertEqual(state.conflicting_queens(), {(1, 3), (2, 2)})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from hints import HintIndex, get_hint_index
+from solution_cache import write_cache
+from solver import solve_bitboard
+from test_support import use_scratch_dir
+
+class TestHintIndex(unittest.TestCase):
+    def setUp(self):
+        use_scratch_dir(self)
+        self.index = get_hint_index(8)
+
+    def assertCompletable(self, board, hint):
+        row, col = hint
+        self.assertEqual(board[row], -1)
+        board = list(board)
+        board[row] = col
+        self.assertGreater(self.index.completions(board), 0)
+
+    def test_empty_board(self):
+        board = [-1] * 8
+        self.assertEqual(self.index.completions(board), 92)
+        self.assertCompletable(board, self.index.hint(board))
+
+    def test_hint_never_leads_to_dead_end(self):
+        # Following hints from any single queen that can be extended always ends in a solution
+        solutions = set(solve_bitboard(8))
+        for row in range(8):
+            for col in range(8):
+                board = [-1] * 8
+                board[row] = col
+                if self.index.completions(board) == 0:
+                    self.assertIsNone(self.index.hint(board))
+                    continue
+                while -1 in board:
+                    hint = self.index.hint(board)
+                    self.assertCompletable(board, hint)
+                    board[hint[0]] = hint[1]
+                self.assertIn(tuple(board), solutions)
+
+    def test_unsalvageable_board(self):
+        board = [0, 1, -1, -1, -1, -1, -1, -1]  # Diagonal conflict
+        self.assertIsNone(self.index.hint(board))
+        board = [0, 2, -1, -1, -1, -1, -1, -1]  # No conflict, but no solution starts this way
+        self.assertEqual(self.index.completions(board), 0)
+        self.assertIsNone(self.index.hint(board))
+
+    def test_queens_in_lower_rows_are_respected(self):
+        board = [-1, -1, -1, -1, -1, -1, -1, 3]
+        row, col = self.index.hint(board)
+        self.assertEqual(row, 0)
+        self.assertNotEqual(col, 3)
+        self.assertCompletable(board, (row, col))
+
+    def test_hints_survive_a_cache_rewrite(self):
+        index = get_hint_index(6)
+        write_cache(6, solve_bitboard(6))
+        self.assertIsNotNone(index.hint([-1] * 6))
+
+    def test_index_is_cached(self):
+        self.assertIs(get_hint_index(8), self.index)
+        self.assertEqual(HintIndex(6).completions([-1] * 6), 4)
+
+if __name__ == '__main__':
+    unittest.main()
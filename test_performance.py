@@ -1,48 +1,116 @@
 import unittest
-from database import record_time
-import time
+import os
 import sqlite3
-import matplotlib.pyplot as plt
-
-execution_times = {}
+import subprocess
+import sys
+import time
+from database import (
+    init_db, record_time, get_connection, get_run_history, get_run_percentiles, get_run_trend
+)
+from benchmark import run_benchmarks, compare_to_baseline, parse_sizes
+from solver import solve_bitboard
 
 class TestPerformanceRecording(unittest.TestCase):
+    def setUp(self):
+        init_db()
+
     def test_record_time(self):
         method_name = "BacktrackingTest"
-        start = time.time()
-        time.sleep(0.1)  # Simulated work
-        end = time.time()
-        elapsed = end - start
+        start = time.perf_counter()
+        solve_bitboard(8)
+        elapsed = time.perf_counter() - start
         record_time(method_name, elapsed)
 
         conn = sqlite3.connect("eight_queens.db")
         c = conn.cursor()
-        c.execute("SELECT time_taken FROM times WHERE method = ?", (method_name,))
+        c.execute("SELECT time_taken FROM times WHERE method = ?", (method_name.lower(),))
         row = c.fetchone()
         conn.close()
 
         self.assertIsNotNone(row)
         self.assertGreater(row[0], 0)
 
-        # Store execution time for graph
-        execution_times[method_name] = elapsed
+    def test_run_history_is_append_only(self):
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM runs WHERE method = 'historytest'")
+        for duration in (0.5, 0.1, 0.2, 0.4, 0.3):
+            record_time("HistoryTest", duration, n=8, options={"workers": 2}, solutions=92)
+        record_time("historytest", 9.0, n=10)  # Same series, different board size
+
+        history = get_run_history("historytest", n=8)
+        self.assertEqual(sorted(run["duration"] for run in history), [0.1, 0.2, 0.3, 0.4, 0.5])
+        starts = [run["started_at"] for run in history]
+        self.assertEqual(starts, sorted(starts))
+        self.assertEqual(history[0]["options"], {"workers": 2})
+        self.assertEqual(history[0]["solutions"], 92)
+        self.assertEqual(len(get_run_history("HistoryTest", limit=2)), 2)
+
+        stats = get_run_percentiles("historytest", n=8)
+        self.assertEqual(stats["count"], 5)
+        self.assertEqual(stats["p50"], 0.3)
+        self.assertEqual(stats["p95"], 0.5)
+        self.assertEqual(get_run_percentiles("historytest")["count"], 6)
+        self.assertIsNone(get_run_percentiles("nosuchmethod"))
+
+        trend = get_run_trend("historytest", n=8)
+        self.assertEqual(len(trend), 1)
+        self.assertEqual(trend[0][1:], (5, 0.3, 0.5))
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_report_covers_engine_matrix(self):
+        report = run_benchmarks(["sequential", "count"], [6, 8], warmup=1, repeat=3)
+        results = {(r["engine"], r["n"]): r for r in report["results"]}
+        self.assertEqual(set(results), {("sequential", 6), ("sequential", 8), ("count", 6), ("count", 8)})
+        self.assertEqual(results[("sequential", 8)]["solutions"], 92)
+        self.assertEqual(results[("count", 8)]["solutions"], 92)
+
+        compute = results[("sequential", 8)]["compute"]
+        self.assertEqual(compute["runs"], 3)
+        self.assertLessEqual(compute["min_ms"], compute["median_ms"])
+        self.assertLessEqual(compute["median_ms"], compute["p95_ms"])
+        self.assertIsNotNone(results[("sequential", 8)]["persist"])
+        self.assertIsNone(results[("count", 8)]["persist"])  # Counting has nothing to persist
+
+    def test_baseline_regression_detection(self):
+        report = run_benchmarks(["sequential"], [6], warmup=0, repeat=1, persist=False)
+        baseline = {"results": [dict(r, compute=dict(r["compute"])) for r in report["results"]]}
+        self.assertEqual(compare_to_baseline(report, baseline), [])
+
+        baseline["results"][0]["compute"]["median_ms"] = report["results"][0]["compute"]["median_ms"] / 2
+        regressions = compare_to_baseline(report, baseline, threshold=0.10)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]["engine"], "sequential")
+
+    def test_report_includes_search_counters(self):
+        report = run_benchmarks(["sequential"], [8], warmup=0, repeat=1, persist=False, instrument=True)
+        self.assertEqual(report["results"][0]["search"]["nodes"], 2056)
+
+    def test_parse_sizes(self):
+        self.assertEqual(parse_sizes("8"), [8])
+        self.assertEqual(parse_sizes("6-8,10"), [6, 7, 8, 10])
 
 
-# After test run, plot result
-def plot_results():
-    methods = list(execution_times.keys())
-    times = list(execution_times.values())
+class TestImportTime(unittest.TestCase):
+    HEADLESS_MODULES = (
+        "solver, database, benchmark, server, solution_index, hints, game_state, cli, solution_cache, shards"
+    )
+    BUDGET = 0.5  # seconds for a cold import; plotting alone used to cost more
 
-    plt.figure(figsize=(6, 4))
-    plt.bar(methods, times, color='orange')
-    plt.title("Unit Test Performance Comparison")
-    plt.ylabel("Execution Time (s)")
-    plt.xlabel("Method")
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
-    plt.tight_layout()
-    plt.show()
+    def test_headless_imports_stay_light(self):
+        script = (
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            f"import {self.HEADLESS_MODULES}\n"
+            "print(time.perf_counter() - start)\n"
+            "print(' '.join(m for m in ('matplotlib', 'PyQt5') if m in sys.modules))\n"
+        )
+        out = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__))).stdout.splitlines()
+        self.assertEqual(out[1:], [""], "headless modules pulled in a GUI or plotting package")
+        self.assertLess(float(out[0]), self.BUDGET)
 
 
 if __name__ == '__main__':
-    unittest.main(exit=False)  # Run test without exiting interpreter
-    plot_results()             # Plot after test
+    unittest.main()
@@ -3,9 +3,15 @@ import os
 import sqlite3
 from database import (
     init_db, save_solution, recognize_solution,
-    all_solutions_recognized, reset_solutions
+    all_solutions_recognized, reset_solutions, get_stored_solutions, current_round
 )
-from solver import solve_sequential
+from solver import (
+    solve_sequential, solve_threaded, solve_parallel, solve_symmetric, solve_streaming, count_solutions,
+    worker_times
+)
+from utils import encode_board
+from instrumentation import SearchStats
+from database import get_run_history
 
 DB_NAME = "eight_queens.db"
 
@@ -30,6 +36,61 @@ class TestEightQueensProject(unittest.TestCase):
         self.assertEqual(len(solutions), 92)
         self.assertEqual(len(set(tuple(sol) for sol in solutions)), 92)
 
+    def test_parallel_matches_sequential(self):
+        sequential = list(solve_sequential())
+        parallel = solve_parallel(workers=2, prefix_depth=2)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(sum(w["tasks"] for w in worker_times.values()), 42)
+
+    def test_symmetric_matches_sequential(self):
+        sequential = list(solve_sequential())
+        self.assertEqual(solve_symmetric(), sequential)
+        self.assertEqual(len(solve_symmetric(canonical_only=True)), 12)
+        self.assertEqual(solve_symmetric(9), solve_sequential(9))
+
+    def test_streaming_solutions_to_database(self):
+        self.assertEqual(solve_streaming(8, limit=10, chunk_size=3), 10)
+        self.assertEqual(len(get_stored_solutions()), 10)
+        self.assertEqual(solve_streaming(8), 92)
+        self.assertEqual(len(get_stored_solutions()), 92)
+
+    def test_count_solutions_modes(self):
+        expected = {4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352}
+        for n, count in expected.items():
+            self.assertEqual(count_solutions(n), count)
+            self.assertEqual(count_solutions(n, symmetric=True), count)
+        self.assertEqual(count_solutions(10, parallel=True, workers=2), 724)
+        self.assertEqual(count_solutions(11, parallel=True, symmetric=True, workers=2), 2680)
+        self.assertEqual(len(get_stored_solutions()), 0)  # Counting never stores boards
+
+    def test_instrumented_runs_are_recorded(self):
+        sequential = SearchStats(8)
+        solve_sequential(8, stats=sequential)
+        self.assertEqual(sequential.nodes, 2056)
+
+        stats = SearchStats(8)
+        self.assertEqual(count_solutions(8, parallel=True, workers=2, stats=stats), 92)
+        self.assertEqual(stats.solutions, 92)
+        self.assertEqual(sum(w["tasks"] for w in stats.workers.values()), 42)
+        self.assertEqual(stats.depth_nodes, sequential.depth_nodes)
+        self.assertEqual(stats.prunes, sequential.prunes)
+
+        symmetric = SearchStats(8)
+        self.assertEqual(count_solutions(8, symmetric=True, stats=symmetric), 92)
+        self.assertEqual(symmetric.solutions, 92)
+        self.assertEqual(get_run_history("count", n=8, limit=1)[0]["stats"]["solutions"], 92)
+        mirrored = SearchStats(9)
+        self.assertEqual(len(solve_symmetric(9, stats=mirrored)), 352)
+        self.assertEqual(mirrored.solutions, 352)
+
+        threaded = SearchStats(8)
+        solve_threaded(8, stats=threaded)
+        self.assertEqual(threaded.depth_nodes, sequential.depth_nodes)
+        self.assertEqual(threaded.branching_factors(), sequential.branching_factors())
+        self.assertEqual(sorted(threaded.subtree_time), list(range(8)))
+        self.assertEqual(len(threaded.workers), 8)
+        self.assertEqual(get_run_history("threaded", n=8, limit=1)[0]["stats"]["nodes"], 2056)
+
     def test_save_and_recognize_solution(self):
         test_solution = str([0, 4, 7, 5, 2, 6, 1, 3])
         save_solution(test_solution)
@@ -56,16 +117,21 @@ class TestEightQueensProject(unittest.TestCase):
         test_solution = str([0, 4, 7, 5, 2, 6, 1, 3])
         save_solution(test_solution)
         recognize_solution(test_solution, "ResetUser")
+        previous_round = current_round()
         reset_solutions()
 
-        # After reset, solution should not be recognized
+        # After reset, solution should not be recognized in the new round
         conn = sqlite3.connect(DB_NAME)
         c = conn.cursor()
-        c.execute("SELECT recognized FROM solutions WHERE solution = ?", (test_solution,))
+        c.execute("SELECT COUNT(*) FROM recognitions WHERE round = (SELECT MAX(id) FROM rounds) "
+                  "AND n = ? AND code = ?", (8, encode_board([0, 4, 7, 5, 2, 6, 1, 3])))
         result = c.fetchone()[0]
         conn.close()
 
         self.assertEqual(result, 0)
+        self.assertFalse(all_solutions_recognized())
+        # The previous round keeps its recognition
+        self.assertIn(((0, 4, 7, 5, 2, 6, 1, 3), "ResetUser", 1), get_stored_solutions(previous_round))
 
 if __name__ == '__main__':
     unittest.main()
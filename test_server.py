@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+from database import init_db, get_connection, save_solutions, get_stored_solutions, start_round
+from server import SubmissionServer, SubmissionClient
+from solver import solve_bitboard
+
+
+class TestSubmissionServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        init_db()
+        conn = get_connection()
+        with conn:
+            conn.execute("DELETE FROM solutions WHERE n = 8")
+        self.solutions = solve_bitboard(8)
+        save_solutions(self.solutions)
+        self.server = SubmissionServer(port=0)
+        await self.server.start()
+        self.host, self.port = self.server.address
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def connect(self):
+        client = await SubmissionClient.connect(self.host, self.port)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    async def test_concurrent_submissions_of_one_board(self):
+        clients = [await self.connect() for _ in range(20)]
+        board = self.solutions[0]
+        replies = await asyncio.gather(*(client.submit(board, f"Player{i}")
+                                         for i, client in enumerate(clients)))
+        self.assertEqual(sum(reply["ok"] for reply in replies), 1)
+        self.assertEqual(sum(reply["message"] == "Solution already recognized." for reply in replies), 19)
+        self.assertEqual(self.server.remaining[8], 91)
+
+    async def test_all_solutions_complete_the_round(self):
+        clients = [await self.connect() for _ in range(4)]
+
+        async def play(i):
+            return [await clients[i].submit(board, f"Player{i}") for board in self.solutions[i::4]]
+
+        replies = [reply for batch in await asyncio.gather(*(play(i) for i in range(4))) for reply in batch]
+        self.assertTrue(all(reply["ok"] for reply in replies))
+        self.assertEqual(min(reply["remaining"] for reply in replies), 0)
+        self.assertLessEqual(self.server.commits, len(self.solutions))
+
+        status = await clients[0].status(8)
+        self.assertEqual(status["remaining"], 0)
+        self.assertTrue(status["complete"])
+        stored = [row for row in get_stored_solutions() if len(row[0]) == 8]
+        self.assertTrue(all(recognized == 1 for _, _, recognized in stored))
+
+    async def test_counts_follow_new_rounds(self):
+        client = await self.connect()
+        reply = await client.submit(self.solutions[0], "Alice")
+        self.assertEqual(reply["remaining"], 91)
+        start_round()  # Another process starts a new round
+        self.assertEqual((await client.status(8))["remaining"], 92)
+        reply = await client.submit(self.solutions[0], "Bob")
+        self.assertTrue(reply["ok"])
+        self.assertEqual(reply["remaining"], 91)
+
+    async def test_bad_requests_keep_the_connection(self):
+        client = await self.connect()
+        reply = await client.request("not a submission")
+        self.assertFalse(reply["ok"])
+        self.assertIn("error", reply)
+        reply = await client.submit([0, 1, 2, 3, 4, 5, 6, 9], "Mallory")
+        self.assertIn("error", reply)
+
+        reply = await client.submit([0, 1, 2, 3, 4, 5, 6, 7], "Mallory")
+        self.assertEqual(reply["message"], "Solution not found.")
+        self.assertEqual(reply["remaining"], 92)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import threading
+import time
+import database
+from shards import (
+    plan_shards, claim_shard, heartbeat, run_shard, complete_shard, reclaim_stale, run_worker,
+    run_workers, shard_progress, merge_shards
+)
+from test_support import use_scratch_dir, database_at
+
+
+class TestShards(unittest.TestCase):
+    def setUp(self):
+        use_scratch_dir(self, db="shards.db")
+        database.init_db()
+
+    def test_plan_work_merge(self):
+        self.assertEqual(plan_shards(8, depth=2), 42)
+        self.assertEqual(plan_shards(8, depth=2), 42)  # Re-planning keeps the job
+        with self.assertRaises(ValueError):
+            plan_shards(8, depth=3)
+        self.assertEqual(run_worker(8, worker="w1"), 42)
+        self.assertEqual(shard_progress(8), {"done": 42})
+        self.assertEqual(merge_shards(8, recheck=5), 92)
+
+    def test_resume_after_interruption(self):
+        plan_shards(10, depth=2)
+        self.assertEqual(run_worker(10, worker="w1", max_shards=10), 10)
+        with self.assertRaises(ValueError):
+            merge_shards(10)
+        # A worker that died holding a shard: its claim is handed out again once stale
+        prefix = claim_shard(10, worker="crashed")
+        self.assertEqual(reclaim_stale(10, stale_after=60), 0)
+        time.sleep(0.01)
+        self.assertEqual(reclaim_stale(10, stale_after=0), 1)
+        run_worker(10, worker="w2")
+        self.assertEqual(merge_shards(10), 724)
+        self.assertFalse(complete_shard(10, prefix, *run_shard(10, prefix)))
+
+    def test_worker_waits_for_a_crashed_claim(self):
+        plan_shards(8, depth=1)
+        claim_shard(8, worker="crashed")
+        self.assertEqual(run_worker(8, worker="w1", stale_after=0.2, heartbeat_interval=0.05, poll_interval=0.05), 8)
+        self.assertEqual(merge_shards(8), 92)
+
+    def test_reclaimed_shard_is_abandoned(self):
+        lost = threading.Event()
+        lost.set()
+        self.assertIsNone(run_shard(14, (0,), cancel=lost))
+        self.assertEqual(run_shard(6, (1,), cancel=lost)[0], 1)  # Too small to reach a check
+
+    def test_heartbeat_keeps_a_claim(self):
+        plan_shards(8, depth=1)
+        prefix = claim_shard(8, worker="slow")
+        time.sleep(0.2)
+        self.assertTrue(heartbeat(8, prefix, worker="slow"))
+        self.assertFalse(heartbeat(8, prefix, worker="other"))
+        self.assertEqual(reclaim_stale(8, stale_after=0.1), 0)  # Claimed long ago, but still beating
+        time.sleep(0.2)
+        self.assertEqual(reclaim_stale(8, stale_after=0.1), 1)
+        self.assertFalse(heartbeat(8, prefix, worker="slow"))
+
+    def test_worker_restores_db_name(self):
+        other = os.path.join(os.path.dirname(database.DB_NAME), "other.db")
+        saved_db = database.DB_NAME
+        with database_at(other):
+            database.init_db()
+            plan_shards(6, depth=1)
+        self.assertEqual(run_worker(6, db=other, heartbeat_interval=0.01), 6)
+        self.assertEqual(database.DB_NAME, saved_db)
+        self.assertEqual(shard_progress(6), {})
+
+    def test_claims_are_exclusive(self):
+        plan_shards(6, depth=1)
+        claimed = [claim_shard(6, worker=f"w{i}") for i in range(7)]
+        self.assertEqual(sorted(claimed[:6]), [(col,) for col in range(6)])
+        self.assertIsNone(claimed[6])
+
+    def test_merge_rejects_tampered_results(self):
+        plan_shards(8, depth=1)
+        run_worker(8)
+        conn = database.get_connection()
+        with conn:
+            conn.execute("UPDATE shards SET count = count + 1 WHERE n = 8 AND prefix = '0'")
+        with self.assertRaises(ValueError):
+            merge_shards(8)
+
+    def test_worker_processes_share_the_file(self):
+        plan_shards(9, depth=2)
+        self.assertEqual(run_workers(9, processes=2, poll_interval=0.05), shard_progress(9)["done"])
+        self.assertEqual(merge_shards(9), 352)
+
+
+if __name__ == '__main__':
+    unittest.main()
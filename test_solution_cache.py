@@ -0,0 +1,79 @@
+import unittest
+import os
+import solution_cache
+from solution_cache import HEADER, CacheWriter, get_solutions, open_cache, write_cache, cache_path
+from solver import solve_bitboard
+from test_support import use_scratch_dir
+from utils import encode_board
+
+
+class TestSolutionCache(unittest.TestCase):
+    def setUp(self):
+        use_scratch_dir(self)
+
+    def test_miss_solves_then_reads_from_disk(self):
+        self.assertIsNone(open_cache(8))
+        cache = get_solutions(8)
+        self.assertTrue(os.path.exists(cache_path(8)))
+        self.assertEqual(list(cache), solve_bitboard(8))
+
+        solution_cache._open_caches.clear()
+        reopened = open_cache(8)
+        self.assertIsNotNone(reopened)
+        self.assertEqual(len(reopened), 92)
+        self.assertEqual(reopened[0], (0, 4, 7, 5, 2, 6, 1, 3))
+        self.assertEqual(reopened[-1], solve_bitboard(8)[-1])
+        self.assertEqual(reopened.code(5), encode_board(reopened[5]))
+        self.assertEqual(reopened[10:13], solve_bitboard(8)[10:13])
+        with self.assertRaises(IndexError):
+            reopened[92]
+
+    def test_columns_match_boards(self):
+        for n in (6, 8, 10):  # 3 bits per row straddles bytes; 4 bits per row does not
+            boards = solve_bitboard(n)
+            cache = get_solutions(n)
+            for row in range(n):
+                self.assertEqual(cache.columns(row), bytes(board[row] for board in boards))
+
+    def test_corrupt_file_is_a_miss(self):
+        write_cache(6, solve_bitboard(6))
+        with open(cache_path(6), "r+b") as f:
+            f.seek(HEADER.size + 1)
+            byte = f.read(1)
+            f.seek(HEADER.size + 1)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        solution_cache._open_caches.clear()
+        self.assertIsNone(open_cache(6))
+        self.assertEqual(list(get_solutions(6)), solve_bitboard(6))  # Rebuilt
+
+        with open(cache_path(7), "wb") as f:
+            f.write(b"NQ")
+        self.assertIsNone(open_cache(7))
+
+    def test_incremental_writer(self):
+        boards = solve_bitboard(8)
+        writer = CacheWriter(8)
+        for start in range(0, len(boards), 10):
+            writer.add(boards[start:start + 10])
+        writer.commit()
+        cache = open_cache(8)
+        self.assertEqual(list(cache), boards)
+
+        write_cache(8, iter(boards[:5]))
+        self.assertEqual(cache[0], boards[0])  # Holders of the replaced cache can still read it
+        self.assertEqual(len(open_cache(8)), 5)
+
+        writer = CacheWriter(8)
+        writer.add(boards[:3])
+        writer.discard()
+        self.assertEqual(len(open_cache(8)), 5)
+        self.assertEqual(os.listdir(solution_cache.CACHE_DIR), ["n8.qsol"])
+
+    def test_no_solutions(self):
+        self.assertEqual(len(get_solutions(3)), 0)
+        self.assertEqual(list(get_solutions(3)), [])
+        self.assertEqual(get_solutions(3).columns(0), b"")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+from database import (
+    init_db, save_solution, recognize_solution, get_stored_solutions, reset_solutions, current_round,
+    get_round_progress
+)
+from solution_index import SolutionIndex
+from test_support import use_scratch_dir
+from utils import encode_board
+
+class TestSolutionIndex(unittest.TestCase):
+    def setUp(self):
+        use_scratch_dir(self, db="index.db")
+        init_db()
+        reset_solutions()
+        self.index = SolutionIndex(8)
+        self.index.warm()
+
+    def test_recognize_in_memory_then_flush(self):
+        board = [1, 3, 5, 7, 2, 0, 6, 4]
+        success, msg = self.index.recognize(board, "Alice")
+        self.assertTrue(success)
+        self.assertEqual(msg, "Solution recognized!")
+        success, msg = self.index.recognize(board, "Bob")
+        self.assertFalse(success)
+        self.assertEqual(msg, "Solution already recognized.")
+
+        self.assertEqual(self.index.flush(), 1)
+        self.assertIn((tuple(board), "Alice", 1), get_stored_solutions())
+
+    def test_warm_loads_recognized_state(self):
+        board = [2, 4, 6, 0, 3, 1, 7, 5]
+        save_solution(str(board))
+        recognize_solution(str(board), "Carol")
+        index = SolutionIndex(8)
+        index.warm()
+        self.assertEqual(index.recognized[encode_board(board)], "Carol")
+
+    def test_reset_clears_memory_and_database(self):
+        board = [0, 4, 7, 5, 2, 6, 1, 3]
+        self.index.recognize(board, "Dave")
+        self.index.flush()
+        self.index.reset()
+        self.assertEqual(self.index.recognized, {})
+        self.assertTrue(self.index.recognize(board, "Eve")[0])
+
+    def test_reset_keeps_pending_recognitions_in_their_round(self):
+        boards = [(0, 4, 7, 5, 2, 6, 1, 3), (1, 3, 5, 7, 2, 0, 6, 4)]
+        self.index.recognize(boards[0], "Alice")
+        self.index.flush()
+        self.index.recognize(boards[1], "Bob")  # Still queued when the round ends
+        first = current_round()
+        self.index.reset()
+
+        self.assertIn((boards[1], "Bob", 1), get_stored_solutions(first))
+        self.assertEqual(get_round_progress(first)[8][0], 2)
+        self.assertEqual(get_round_progress()[8][0], 0)
+        self.assertEqual(self.index.flush(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,12 @@
 import unittest
-from solver import is_safe
+import threading
+import time
+from solver import (
+    is_safe, solve_bitboard, iter_solutions, iter_solutions_threaded, solve_min_conflicts, _prefixes,
+    _solve_prefix
+)
+from instrumentation import SearchStats
+from utils import canonical_form, expand_solutions, symmetries, encode_board, decode_board
 
 class TestEightQueens(unittest.TestCase):
 
@@ -9,6 +16,118 @@ class TestEightQueens(unittest.TestCase):
         self.assertFalse(is_safe(board, 1, 1))  # Same diagonal
         self.assertTrue(is_safe(board, 1, 2))   # Safe
 
+    def test_bitboard_solution_counts(self):
+        expected = {1: 1, 2: 0, 3: 0, 4: 2, 5: 10, 6: 4, 7: 40, 8: 92, 9: 352, 10: 724}
+        for n, count in expected.items():
+            self.assertEqual(len(solve_bitboard(n)), count)
+
+    def test_bitboard_solutions_are_valid(self):
+        for board in solve_bitboard(8):
+            for row in range(8):
+                self.assertTrue(is_safe(list(board), row, board[row]))
+
+    def test_prefix_tasks_cover_search_tree(self):
+        for depth in (1, 2, 3):
+            merged = []
+            for prefix in _prefixes(8, depth):
+                found, elapsed, pid, stats = _solve_prefix(8, prefix)
+                merged.extend(found)
+            self.assertEqual(merged, solve_bitboard(8))
+
+    def test_canonical_form_groups_fundamental_solutions(self):
+        canonical = {canonical_form(board) for board in solve_bitboard(8)}
+        self.assertEqual(len(canonical), 12)
+        self.assertEqual(expand_solutions(canonical), solve_bitboard(8))
+
+    def test_symmetries_share_canonical_key(self):
+        board = (0, 4, 7, 5, 2, 6, 1, 3)
+        for image in symmetries(board):
+            self.assertEqual(canonical_form(image), canonical_form(board))
+
+    def test_encode_decode_round_trip(self):
+        for n in (1, 4, 8, 16, 20):
+            board = tuple((3 * row + 1) % n for row in range(n))
+            self.assertEqual(decode_board(encode_board(board), n), board)
+        self.assertEqual(len({encode_board(b) for b in solve_bitboard(8)}), 92)
+
+    def test_encode_rejects_off_board_columns(self):
+        # Each would alias a real board: (8, 0, ...) packs like (0, 1, ...), (5, 2, 0, 2) like (1, 3, 0, 2)
+        for board in ((8, 0, 0, 0, 0, 0, 0, 0), (5, 2, 0, 2), (0, -1, 2, 3)):
+            with self.assertRaises(ValueError):
+                encode_board(board)
+
+    def test_iter_solutions_streams_with_limit(self):
+        solutions = iter_solutions(8)
+        self.assertEqual(next(solutions), (0, 4, 7, 5, 2, 6, 1, 3))
+        self.assertEqual(list(iter_solutions(8, limit=5)), solve_bitboard(8)[:5])
+        self.assertEqual(list(iter_solutions(8, prefix=(7, 1))),
+                         [s for s in solve_bitboard(8) if s[:2] == (7, 1)])
+
+    def test_iter_solutions_counts_nodes(self):
+        stats = SearchStats(8)
+        self.assertEqual(len(list(iter_solutions(8, stats=stats))), 92)
+        self.assertEqual(stats.nodes, 2056)  # Queens placed by the full 8x8 backtracking search
+        self.assertEqual(stats.solutions, 92)
+        self.assertEqual(stats.depth_nodes[0], 8)
+        self.assertEqual(stats.depth_nodes[7], 92)
+        self.assertEqual(sum(stats.depth_nodes), stats.nodes)
+        self.assertEqual(sorted(stats.subtree_time), list(range(8)))
+        self.assertGreater(stats.prunes, 0)
+        self.assertEqual(stats.branching_factors()[0], stats.depth_nodes[1] / 8)
+
+    def test_cancel_stops_between_solutions(self):
+        cancel = threading.Event()
+        cancel.set()
+        self.assertLess(len(list(iter_solutions(14, cancel=cancel))), 365596)
+        self.assertLess(len(list(iter_solutions(14, cancel=cancel, stats=SearchStats(14)))), 365596)
+        self.assertEqual(list(iter_solutions(8, cancel=threading.Event())), solve_bitboard(8))
+
+    def test_threaded_iteration(self):
+        self.assertEqual(sorted(iter_solutions_threaded(8)), solve_bitboard(8))
+        cancel = threading.Event()
+        boards = iter_solutions_threaded(14, cancel=cancel)
+        next(boards)
+        cancel.set()
+        self.assertLess(len(list(boards)), 365596)
+
+        thread_stats = [SearchStats(10) for _ in range(10)]
+        boards = iter_solutions_threaded(10, thread_stats=thread_stats, buffer=10)
+        next(boards)
+        time.sleep(0.2)
+        # The threads stop once the buffer is full: 10 queued, one blocked per thread, one taken
+        self.assertLessEqual(sum(stats.solutions for stats in thread_stats), 10 + 10 + 1)
+        self.assertEqual(len(list(boards)), 723)
+
+    def test_instrumented_subtasks_merge(self):
+        total = SearchStats(8)
+        for prefix in _prefixes(8, 2):
+            found, elapsed, pid, task_stats = _solve_prefix(8, prefix, instrument=True)
+            total.merge(task_stats, worker=pid)
+        full = SearchStats(8)
+        list(iter_solutions(8, stats=full))
+        self.assertEqual(total.solutions, 92)
+        self.assertEqual(total.depth_nodes[2:], full.depth_nodes[2:])
+        self.assertEqual(sum(w["tasks"] for w in total.workers.values()), 42)
+
+    def assertValidBoard(self, board):
+        n = len(board)
+        self.assertEqual(len(set(board)), n)
+        self.assertEqual(len({row - col for row, col in enumerate(board)}), n)
+        self.assertEqual(len({row + col for row, col in enumerate(board)}), n)
+
+    def test_min_conflicts_small_boards(self):
+        for n in [1] + list(range(4, 30)):
+            for seed in range(3):
+                self.assertValidBoard(solve_min_conflicts(n, seed=seed))
+        self.assertIn(solve_min_conflicts(8, seed=1), set(solve_bitboard(8)))
+        with self.assertRaises(ValueError):
+            solve_min_conflicts(3)
+
+    def test_min_conflicts_large_board_is_reproducible(self):
+        board = solve_min_conflicts(20000, seed=7)
+        self.assertValidBoard(board)
+        self.assertEqual(solve_min_conflicts(20000, seed=7), board)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,40 @@
+"""Fixtures shared by the test modules."""
+import contextlib
+import os
+import tempfile
+import database
+import solution_cache
+
+
+def use_scratch_dir(test, db=None):
+    """Point the solution cache, and the database if db names a file, at a fresh temporary directory.
+
+    Everything is restored by test's cleanups. Returns the directory.
+    """
+    scratch = tempfile.TemporaryDirectory()
+    test.addCleanup(scratch.cleanup)
+    saved_dir, saved_db = solution_cache.CACHE_DIR, database.DB_NAME
+    solution_cache.CACHE_DIR = scratch.name
+    solution_cache._open_caches.clear()
+    if db is not None:
+        database.DB_NAME = os.path.join(scratch.name, db)
+
+    def restore():
+        if db is not None:
+            database.close_connections()
+            database.DB_NAME = saved_db
+        solution_cache._open_caches.clear()
+        solution_cache.CACHE_DIR = saved_dir
+    test.addCleanup(restore)
+    return scratch.name
+
+@contextlib.contextmanager
+def database_at(path):
+    """Run the block against the database file at path, restoring DB_NAME afterwards."""
+    saved_db = database.DB_NAME
+    database.DB_NAME = path
+    try:
+        yield
+    finally:
+        database.close_connections()
+        database.DB_NAME = saved_db
@@ -1,22 +1,22 @@
-import time
-import random
 from PyQt5.QtWidgets import (
     QWidget, QLabel, QPushButton, QTextEdit,
-    QVBoxLayout, QHBoxLayout, QLineEdit, QMessageBox, QGridLayout, QScrollArea,
-    QDialog
+    QVBoxLayout, QHBoxLayout, QLineEdit, QMessageBox, QScrollArea,
+    QDialog, QSizePolicy, QTableView, QComboBox, QCheckBox, QHeaderView
+)
+from PyQt5.QtGui import QPainter, QColor, QPixmap, QFont, QRegion
+from PyQt5.QtCore import (
+    Qt, QTimer, QThreadPool, QRect, QSize, pyqtSignal, QAbstractTableModel, QModelIndex
 )
-import matplotlib.pyplot as plt
-from PyQt5.QtGui import QPainter, QColor, QPixmap, QFont
-from PyQt5.QtCore import Qt
-from solver import solve_sequential, solve_threaded
 from database import (
-    recognize_solution,
-    all_solutions_recognized,
-    reset_solutions,
     get_stored_data,
-    get_stored_solutions
+    get_solutions_page
 )
 from utils import format_solution
+from solution_index import SolutionIndex
+from hints import get_hint_index
+from game_state import BoardState
+from workers import SolverWorker, CompareWorker
+from solver import solve_min_conflicts
 
 
 BOARD_SIZE = 8  # 8x8 board
@@ -24,7 +24,17 @@ BOARD_SIZE = 8  # 8x8 board
 class GameUI(QWidget):
     def __init__(self):
         super().__init__()
-        self.board = [-1] * BOARD_SIZE  # -1 means no queen in that row
+        self.state = BoardState(BOARD_SIZE)
+        self.board = self.state.board  # -1 means no queen in that row
+        self.index = SolutionIndex(BOARD_SIZE)
+        self.index.warm()
+        self.hints = get_hint_index(BOARD_SIZE)
+        # Recognitions are written to the database in the background
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.index.flush)
+        self.flush_timer.start(1000)
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_worker = None
         self.init_ui()
 
     def init_ui(self):
@@ -55,40 +65,10 @@ class GameUI(QWidget):
         """)
         self.layout.addWidget(self.name_input)
 
-        # Board Grid Layout with visual improvements
-        self.board_grid = QGridLayout()
-        self.board_buttons = [[QPushButton() for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                btn = self.board_buttons[row][col]
-                btn.setFixedSize(60, 60)
-                # Set alternating colors for chess board pattern
-                is_light_square = (row + col) % 2 == 0
-                base_color = "#F0D9B5" if is_light_square else "#B58863"  # Classic chess colors
-                hover_color = "#BCE784" if is_light_square else "#8EAF6F"  # Green highlight on hover
-                
-                btn.setStyleSheet(f"""
-                    QPushButton {{
-                        background-color: {base_color};
-                        color: #2C3E50;
-                        border: 1px solid #34495E;
-                        border-radius: 0px;
-                        font-size: 24px;
-                        font-weight: bold;
-                    }}
-                    QPushButton:hover {{
-                        background-color: {hover_color};
-                        border: 2px solid #2980B9;
-                    }}
-                    QPushButton:pressed {{
-                        background-color: #E74C3C;
-                        border: 2px solid #C0392B;
-                    }}
-                """)
-                btn.clicked.connect(lambda _, r=row, c=col: self.place_queen(r, c))
-                self.board_grid.addWidget(btn, row, col)
-
-        self.layout.addLayout(self.board_grid)
+        # Board drawn as a single custom-painted widget
+        self.board_widget = BoardWidget(self.state)
+        self.board_widget.squareClicked.connect(self.place_queen)
+        self.layout.addWidget(self.board_widget)
 
         # Action Buttons Layout (Submit, Solve, etc.)
         button_style = """
@@ -128,6 +108,11 @@ class GameUI(QWidget):
         self.compare_button.setStyleSheet(button_style)
         self.compare_button.clicked.connect(self.compare_algorithms)
 
+        self.cancel_button = QPushButton('Cancel')
+        self.cancel_button.setStyleSheet(button_style)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_worker)
+
         self.view_data_button = QPushButton('View Stored Solutions')
         self.view_data_button.setStyleSheet(button_style)
         self.view_data_button.clicked.connect(self.view_data)
@@ -148,6 +133,7 @@ class GameUI(QWidget):
         button_layout.addWidget(self.threaded_button)
         button_layout.addWidget(self.auto_solve_button)
         button_layout.addWidget(self.compare_button)
+        button_layout.addWidget(self.cancel_button)
         button_layout.addWidget(self.view_data_button)
         button_layout.addWidget(self.restart_button)
 
@@ -176,18 +162,78 @@ class GameUI(QWidget):
         self.setLayout(main_layout)
 
     def place_queen(self, row, col):
-        for c in range(BOARD_SIZE):
-            self.board_buttons[row][c].setText('')
-        self.board_buttons[row][col].setText('♛')
-        self.board[row] = col
+        old = self.state.board[row]
+        self.state.place(row, col)
+        # Only squares on the lines through the old and new square can change
+        squares = self.state.lines_through(row, col)
+        if old != -1:
+            squares |= self.state.lines_through(row, old)
+        self.board_widget.update_squares(squares)
+
+    def set_board(self, board):
+        """Replace every queen at once (restart, auto solve)"""
+        self.state.clear()
+        for row, col in enumerate(board):
+            if col != -1:
+                self.state.place(row, col)
+        self.board_widget.update()
+
+    def start_worker(self, worker, on_finished):
+        """Run a background worker, keeping the solver buttons locked until it ends"""
+        if self.current_worker is not None:
+            QMessageBox.warning(self, "Busy", "A solver is already running.")
+            return
+        worker.signals.message.connect(self.output.append)
+        worker.signals.error.connect(self.on_worker_error)
+        worker.signals.finished.connect(on_finished)
+        self.current_worker = worker
+        self.set_solver_buttons_enabled(False)
+        self.thread_pool.start(worker)
+
+    def set_solver_buttons_enabled(self, enabled):
+        for button in (self.sequential_button, self.threaded_button, self.compare_button):
+            button.setEnabled(enabled)
+        self.cancel_button.setEnabled(not enabled)
+
+    def worker_done(self):
+        self.current_worker = None
+        self.set_solver_buttons_enabled(True)
+
+    def cancel_worker(self):
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.output.append("Cancelling...")
+
+    def on_worker_error(self, message):
+        self.worker_done()
+        QMessageBox.critical(self, "Error", message)
+
+    def run_solver(self, method):
+        self.output.append(f"Solving {BOARD_SIZE}x{BOARD_SIZE} board ({method})...\n")
+        worker = SolverWorker(method, BOARD_SIZE)
+        worker.signals.solutions.connect(self.show_solutions)
+        worker.signals.progress.connect(self.show_progress)
+        self.start_worker(worker, lambda result: self.on_solver_finished(method, result))
+
+    def show_solutions(self, boards):
+        self.output.append("\n".join(str(list(board)) for board in boards))
+
+    def show_progress(self, found, nodes):
+        self.instructions.setText(f"Solutions found: {found}   Nodes explored: {nodes}")
+
+    def on_solver_finished(self, method, result):
+        self.worker_done()
+        self.instructions.setText('Click to place queens! (one per row)')
+        if result["cancelled"]:
+            QMessageBox.information(self, "Cancelled", f"Stopped after {result['found']} solutions.")
+        else:
+            QMessageBox.information(self, "Done", f"{method.capitalize()} solving completed and saved!")
 
     def run_sequential(self):
-        solve_sequential()
-        QMessageBox.information(self, "Done", "Sequential solving completed and saved!")
+        self.run_solver("sequential")
 
     def run_threaded(self):
-        solve_threaded()
-        QMessageBox.information(self, "Done", "Threaded solving completed and saved!")
+        self.run_solver("threaded")
 
     def submit_solution(self):
         try:
@@ -195,15 +241,14 @@ class GameUI(QWidget):
             if not player_name:
                 QMessageBox.warning(self, "Error", "Name cannot be empty.")
                 return
-            if any(col == -1 for col in self.board):
+            if not self.state.is_complete():
                 QMessageBox.warning(self, "Error", "You must place a queen in every row.")
                 return
-            if len(set(self.board)) != BOARD_SIZE:
-                QMessageBox.warning(self, "Error", "Queens must be in different columns.")
+            if not self.state.is_solution():
+                QMessageBox.warning(self, "❌ Incorrect Solution", self.state.conflict_reason())
                 return
 
-            formatted = str(self.board)
-            success, msg = recognize_solution(formatted, player_name)
+            success, msg = self.index.recognize(self.board, player_name)
             if success:
                 win_msg = QMessageBox()
                 win_msg.setIcon(QMessageBox.Information)
@@ -218,75 +263,37 @@ class GameUI(QWidget):
             else:
                 QMessageBox.warning(self, "Already Recognized", f"{msg}")
 
-            if all_solutions_recognized():
+            if self.index.all_recognized():
                 QMessageBox.information(self, "Completed", "All solutions recognized! Resetting...")
-                reset_solutions()
+                self.index.reset()
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
 
     def auto_solve(self):
-        solution = []
-
-        def is_safe(row, col):
-            for r, c in enumerate(solution):
-                if c == col or abs(c - col) == abs(r - row):
-                    return False
-            return True
-
-        def solve(row=0):
-            if row == BOARD_SIZE:
-                return True
-            cols = list(range(BOARD_SIZE))
-            random.shuffle(cols)
-            for col in cols:
-                if is_safe(row, col):
-                    solution.append(col)
-                    if solve(row + 1):
-                        return True
-                    solution.pop()
-            return False
-
-        if solve():
-            self.board = solution.copy()
-            for r in range(BOARD_SIZE):
-                for c in range(BOARD_SIZE):
-                    self.board_buttons[r][c].setText('')
-            for r in range(BOARD_SIZE):
-                self.board_buttons[r][solution[r]].setText('♛')
-            QMessageBox.information(self, "Solved", "A new solution has been auto-filled! 🎉")
-        else:
+        try:
+            solution = solve_min_conflicts(BOARD_SIZE)
+        except ValueError:
             QMessageBox.warning(self, "Failed", "Could not find a solution.")
+            return
+        self.set_board(solution)
+        QMessageBox.information(self, "Solved", "A new solution has been auto-filled! 🎉")
 
     def compare_algorithms(self):
         self.output.append("Comparing algorithms over 10 runs each...\n")
+        self.start_worker(CompareWorker(BOARD_SIZE, runs=10), self.show_comparison)
 
-        sequential_times = []
-        threaded_times = []
-
-        for i in range(10):
-            self.output.append(f"Run {i+1}...\n")
-
-            # Sequential
-            start_seq = time.time()
-            solve_sequential()
-            end_seq = time.time()
-            seq_time = end_seq - start_seq
-            sequential_times.append(seq_time)
-
-            # Threaded
-            start_thr = time.time()
-            solve_threaded()
-            end_thr = time.time()
-            thr_time = end_thr - start_thr
-            threaded_times.append(thr_time)
-
-        # Averages
-        avg_seq = sum(sequential_times) / 10
-        avg_thr = sum(threaded_times) / 10
+    def show_comparison(self, result):
+        self.worker_done()
+        sequential_times = result["sequential"]
+        threaded_times = result["threaded"]
+        runs = len(sequential_times)
+        if runs == 0:
+            self.output.append("Comparison cancelled.\n")
+            return
 
-        from database import record_time
-        record_time("Sequential", avg_seq)
-        record_time("Threaded", avg_thr)
+        # Averages (each individual run is already in the run history)
+        avg_seq = sum(sequential_times) / runs
+        avg_thr = sum(threaded_times) / runs
 
         self.output.append(
             f"\n--- Results ---\n"
@@ -294,19 +301,22 @@ class GameUI(QWidget):
             f"Average Threaded Time: {avg_thr:.4f} seconds\n"
         )
 
+        # Imported here so startup does not pay for the plotting stack
+        import matplotlib.pyplot as plt
+
         # Create one figure with two subplots
         fig, axs = plt.subplots(1, 2, figsize=(12, 5))
 
         # Sequential Plot
-        axs[0].plot(range(1, 11), sequential_times, marker='o', color='skyblue')
-        axs[0].set_title("Sequential Algorithm (10 Runs)")
+        axs[0].plot(range(1, runs + 1), sequential_times, marker='o', color='skyblue')
+        axs[0].set_title(f"Sequential Algorithm ({runs} Runs)")
         axs[0].set_xlabel("Run Number")
         axs[0].set_ylabel("Time (seconds)")
         axs[0].grid(True)
 
         # Threaded Plot
-        axs[1].plot(range(1, 11), threaded_times, marker='o', color='lightgreen')
-        axs[1].set_title("Threaded Algorithm (10 Runs)")
+        axs[1].plot(range(1, runs + 1), threaded_times, marker='o', color='lightgreen')
+        axs[1].set_title(f"Threaded Algorithm ({runs} Runs)")
         axs[1].set_xlabel("Run Number")
         axs[1].set_ylabel("Time (seconds)")
         axs[1].grid(True)
@@ -315,11 +325,10 @@ class GameUI(QWidget):
         plt.tight_layout()
         plt.show()
 
-
-
     def view_data(self):
         """Display stored solutions in a popup window"""
         try:
+            self.index.flush()
             dialog = SolutionsDialog(self)
             dialog.exec_()
         except Exception as e:
@@ -327,33 +336,237 @@ class GameUI(QWidget):
 
     def restart_game(self):
         """Reset the game to initial state"""
-        self.board = [-1] * BOARD_SIZE
         self.name_input.clear()
         # Clear all queens from the board
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                self.board_buttons[row][col].setText('')
+        self.set_board([-1] * BOARD_SIZE)
         self.output.clear()
 
     def show_hint(self):
-        """Show a hint for the next safe queen placement"""
-        for row in range(BOARD_SIZE):
-            if self.board[row] == -1:
-                for col in range(BOARD_SIZE):
-                    if self.is_safe(row, col):
-                        QMessageBox.information(self, "Hint", 
-                            f"Try placing a queen at row {row + 1}, column {col + 1}.")
-                        return
-                break
-        QMessageBox.warning(self, "Hint", "No safe position found.")
-
-    def is_safe(self, row, col):
-        """Check if it's safe to place a queen at the given position"""
-        for r in range(row):
-            c = self.board[r]
-            if c == col or abs(c - col) == abs(r - row):
-                return False
-        return True
+        """Suggest a placement that can still be extended to a full solution"""
+        if self.state.is_complete():
+            QMessageBox.information(self, "Hint", "Every row has a queen. Submit your solution!")
+            return
+        hint = self.hints.hint(self.board)
+        if hint is None:
+            QMessageBox.warning(self, "Hint",
+                "No solution contains the queens placed so far. Try moving one.")
+            return
+        row, col = hint
+        QMessageBox.information(self, "Hint",
+            f"Try placing a queen at row {row + 1}, column {col + 1}.")
+
+    def closeEvent(self, event):
+        """Write any pending recognitions before the window goes away"""
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.thread_pool.waitForDone()
+        self.flush_timer.stop()
+        self.index.flush()
+        super().closeEvent(event)
+
+
+class BoardWidget(QWidget):
+    """Chess board for a BoardState, painted with QPainter.
+
+    Squares scale with the widget, clicks are hit-tested to (row, col) and
+    only the squares that changed are repainted.
+    """
+    squareClicked = pyqtSignal(int, int)
+
+    LIGHT = QColor("#F0D9B5")  # Classic chess colors
+    DARK = QColor("#B58863")
+    LIGHT_HOVER = QColor("#BCE784")  # Green highlight on hover
+    DARK_HOVER = QColor("#8EAF6F")
+    LIGHT_ATTACKED = QColor("#E8B4A0")  # Squares under attack
+    DARK_ATTACKED = QColor("#A8705A")
+    CONFLICT = QColor("#E74C3C")  # Queens that attack each other
+    QUEEN = QColor("#2C3E50")
+    GRID = QColor("#34495E")
+
+    def __init__(self, state, parent=None):
+        super().__init__(parent)
+        self.state = state
+        self.hover = None
+        self.setMouseTracking(True)
+        self.setMinimumSize(240, 240)
+        policy = QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        policy.setHeightForWidth(True)
+        self.setSizePolicy(policy)
+
+    def sizeHint(self):
+        return QSize(480, 480)
+
+    def heightForWidth(self, width):
+        return width
+
+    def board_geometry(self):
+        """Return (left, top, square size) of the largest centred board that fits"""
+        side = min(self.width(), self.height())
+        cell = max(1, side // self.state.n)
+        board_side = cell * self.state.n
+        return (self.width() - board_side) // 2, (self.height() - board_side) // 2, cell
+
+    def square_rect(self, row, col):
+        left, top, cell = self.board_geometry()
+        return QRect(left + col * cell, top + row * cell, cell, cell)
+
+    def square_at(self, pos):
+        left, top, cell = self.board_geometry()
+        col = (pos.x() - left) // cell
+        row = (pos.y() - top) // cell
+        if 0 <= row < self.state.n and 0 <= col < self.state.n:
+            return row, col
+        return None
+
+    def update_squares(self, squares):
+        """Schedule a repaint of just the given squares"""
+        region = QRegion()
+        for row, col in squares:
+            region = region.united(self.square_rect(row, col))
+        self.update(region)
+
+    def mousePressEvent(self, event):
+        square = self.square_at(event.pos())
+        if event.button() == Qt.LeftButton and square is not None:
+            self.squareClicked.emit(*square)
+
+    def mouseMoveEvent(self, event):
+        square = self.square_at(event.pos())
+        if square != self.hover:
+            changed = [sq for sq in (self.hover, square) if sq is not None]
+            self.hover = square
+            self.update_squares(changed)
+
+    def leaveEvent(self, event):
+        if self.hover is not None:
+            changed, self.hover = [self.hover], None
+            self.update_squares(changed)
+
+    def paintEvent(self, event):
+        n = self.state.n
+        left, top, cell = self.board_geometry()
+        dirty = event.rect()
+        # Only walk the rows and columns that intersect the dirty rectangle
+        first_row = max(0, (dirty.top() - top) // cell)
+        last_row = min(n - 1, (dirty.bottom() - top) // cell)
+        first_col = max(0, (dirty.left() - left) // cell)
+        last_col = min(n - 1, (dirty.right() - left) // cell)
+
+        painter = QPainter(self)
+        font = QFont()
+        font.setPixelSize(max(1, int(cell * 0.6)))
+        font.setBold(True)
+        painter.setFont(font)
+        painter.setPen(self.GRID if cell >= 6 else Qt.NoPen)
+        for row in range(first_row, last_row + 1):
+            queen = self.state.board[row]
+            for col in range(first_col, last_col + 1):
+                rect = QRect(left + col * cell, top + row * cell, cell, cell)
+                painter.fillRect(rect, self.square_color(row, col))
+                if cell >= 6:
+                    painter.drawRect(rect.adjusted(0, 0, -1, -1))
+                if queen == col:
+                    if cell >= 12:
+                        painter.setPen(self.QUEEN)
+                        painter.drawText(rect, Qt.AlignCenter, '♛')
+                        painter.setPen(self.GRID if cell >= 6 else Qt.NoPen)
+                    else:
+                        painter.fillRect(rect, self.QUEEN)  # too small for a glyph
+        painter.end()
+
+    def square_color(self, row, col):
+        light = (row + col) % 2 == 0
+        if (row, col) == self.hover:
+            return self.LIGHT_HOVER if light else self.DARK_HOVER
+        if self.state.is_attacked(row, col):
+            if self.state.board[row] == col:
+                return self.CONFLICT
+            return self.LIGHT_ATTACKED if light else self.DARK_ATTACKED
+        return self.LIGHT if light else self.DARK
+
+
+class SolutionsModel(QAbstractTableModel):
+    """Table model over the solutions table, fetched page by page as the view scrolls"""
+    HEADERS = ["Solution", "Recognized by", "Status"]
+    PAGE_SIZE = 200
+    THUMBNAIL_SIZE = 48
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows = []
+        self.cursor = None
+        self.exhausted = True
+        self.filters = {}
+        self.thumbnails = False
+
+    def set_filter(self, recognized=None, player=None):
+        """Start over from the first page with new filters"""
+        self.beginResetModel()
+        self.filters = {"recognized": recognized, "player": player or None}
+        self.rows = []
+        self.cursor = None
+        self.exhausted = False
+        self.endResetModel()
+        self.fetchMore(QModelIndex())
+
+    def set_thumbnails(self, enabled):
+        self.thumbnails = enabled
+        if self.rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.rows) - 1, 0))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        board, recognized_by, recognized = self.rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return str(list(board))
+            if column == 1:
+                return recognized_by or ""
+            return "Recognized" if recognized else "Not Recognized"
+        if role == Qt.DecorationRole and column == 0 and self.thumbnails:
+            return self.thumbnail(board)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self.exhausted:
+            return
+        page, self.cursor = get_solutions_page(self.cursor, self.PAGE_SIZE, **self.filters)
+        self.exhausted = self.cursor is None
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def thumbnail(self, board):
+        """Small picture of a board, drawn on demand for the visible rows only"""
+        n = len(board)
+        cell = max(1, self.THUMBNAIL_SIZE // n)
+        pixmap = QPixmap(cell * n, cell * n)
+        painter = QPainter(pixmap)
+        for row in range(n):
+            for col in range(n):
+                light = (row + col) % 2 == 0
+                painter.fillRect(col * cell, row * cell, cell, cell,
+                                 BoardWidget.LIGHT if light else BoardWidget.DARK)
+            painter.fillRect(board[row] * cell, row * cell, cell, cell, BoardWidget.QUEEN)
+        painter.end()
+        return pixmap
 
 
 class SolutionsDialog(QDialog):
@@ -377,20 +590,40 @@ class SolutionsDialog(QDialog):
         title.setAlignment(Qt.AlignCenter)
         layout.addWidget(title)
         
-        # Solutions display
-        self.solutions_text = QTextEdit()
-        self.solutions_text.setReadOnly(True)
-        self.solutions_text.setStyleSheet("""
-            QTextEdit {
+        # Filters
+        filter_layout = QHBoxLayout()
+        self.status_filter = QComboBox()
+        self.status_filter.addItems(["All", "Recognized", "Not Recognized"])
+        self.status_filter.currentIndexChanged.connect(self.load_solutions)
+        filter_layout.addWidget(self.status_filter)
+        self.player_filter = QLineEdit()
+        self.player_filter.setPlaceholderText("Filter by player")
+        self.player_filter.editingFinished.connect(self.load_solutions)
+        filter_layout.addWidget(self.player_filter)
+        self.thumbnail_toggle = QCheckBox("Thumbnails")
+        filter_layout.addWidget(self.thumbnail_toggle)
+        layout.addLayout(filter_layout)
+
+        # Solutions display, fetched lazily as the table scrolls
+        self.model = SolutionsModel(self)
+        self.thumbnail_toggle.toggled.connect(self.toggle_thumbnails)
+        self.solutions_view = QTableView()
+        self.solutions_view.setModel(self.model)
+        self.solutions_view.setIconSize(QSize(SolutionsModel.THUMBNAIL_SIZE, SolutionsModel.THUMBNAIL_SIZE))
+        self.solutions_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.solutions_view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.solutions_view.setStyleSheet("""
+            QTableView {
                 background-color: #444;
                 border-radius: 8px;
-                padding: 15px;
                 font-size: 14px;
                 color: #e0e0e0;
                 border: 2px solid #aaa;
             }
         """)
-        layout.addWidget(self.solutions_text)
+        layout.addWidget(self.solutions_view)
+        self.message = QLabel()
+        layout.addWidget(self.message)
         
         # Close button
         close_button = QPushButton("Close")
@@ -420,18 +653,14 @@ class SolutionsDialog(QDialog):
     
     def load_solutions(self):
         try:
-            solutions = get_stored_solutions()
-            if solutions:
-                text = "=== Stored Solutions ===\n\n"
-                for solution, recognized_by, recognized in solutions:
-                    text += f"Solution: {solution}\n"
-                    if recognized_by:
-                        text += f"Recognized by: {recognized_by}\n"
-                    text += f"Status: {'Recognized' if recognized else 'Not Recognized'}\n"
-                    text += "=" * 40 + "\n\n"
-            else:
-                text = "No stored solutions found."
-            
-            self.solutions_text.setText(text)
+            status = self.status_filter.currentIndex()
+            recognized = {0: None, 1: True, 2: False}[status]
+            self.model.set_filter(recognized, self.player_filter.text().strip())
+            self.message.setText("" if self.model.rows else "No stored solutions found.")
         except Exception as e:
-            self.solutions_text.setText(f"Error loading solutions: {str(e)}")
+            self.message.setText(f"Error loading solutions: {str(e)}")
+
+    def toggle_thumbnails(self, enabled):
+        self.model.set_thumbnails(enabled)
+        self.solutions_view.verticalHeader().setDefaultSectionSize(
+            SolutionsModel.THUMBNAIL_SIZE + 4 if enabled else 30)
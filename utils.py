@@ -1,11 +1,79 @@
+import math
+
+
 def format_solution(board):
+    n = len(board)
     display = ""
-    for row in range(8):
+    for row in range(n):
         line = ""
-        for col in range(8):
+        for col in range(n):
             if board[row] == col:
                 line += "Q "
             else:
                 line += ". "
         display += line.strip() + "\n"
     return display.strip()
+
+def symmetries(board):
+    """Return the 8 images of board under the rotations and reflections of the square."""
+    n = len(board)
+    images = []
+    current = tuple(board)
+    for _ in range(4):
+        images.append(current)
+        images.append(tuple(n - 1 - col for col in current))
+        rotated = [0] * n
+        for row, col in enumerate(current):
+            rotated[col] = n - 1 - row
+        current = tuple(rotated)
+    return images
+
+def canonical_form(board):
+    """Smallest symmetric image of board; equal for boards in the same orbit."""
+    return min(symmetries(board))
+
+def expand_solutions(boards):
+    """Expand canonical boards into every distinct board of their orbits, sorted."""
+    expanded = set()
+    for board in boards:
+        expanded.update(symmetries(board))
+    return sorted(expanded)
+
+def parse_board(text):
+    """Parse a stored board such as "[0, 4, 7, 5]" or "0,4,7,5" into a tuple."""
+    return tuple(int(part) for part in text.strip().strip("[]()").split(","))
+
+def bits_per_row(n):
+    """Number of bits needed to store one column index of an n x n board."""
+    return max(1, (n - 1).bit_length())
+
+def code_width(n):
+    """Bytes needed to store one encode_board code of an n x n board."""
+    return (n * bits_per_row(n) + 7) // 8
+
+def encode_board(board):
+    """Pack a board into an int, bits_per_row(n) bits per row with row 0 lowest.
+
+    Raises ValueError for a column outside 0..n-1, which would otherwise
+    spill into the next row's bits and alias another board.
+    """
+    n = len(board)
+    bits = bits_per_row(n)
+    code = 0
+    for row, col in enumerate(board):
+        if not 0 <= col < n:
+            raise ValueError(f"Column {col} in row {row} is off the {n}x{n} board")
+        code |= col << (row * bits)
+    return code
+
+def decode_board(code, n):
+    """Inverse of encode_board for an n x n board."""
+    bits = bits_per_row(n)
+    mask = (1 << bits) - 1
+    return tuple((code >> (row * bits)) & mask for row in range(n))
+
+def percentile(values, pct):
+    """Nearest-rank percentile (pct in 0..100) of a non-empty sequence."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * pct / 100))
+    return ordered[min(rank, len(ordered)) - 1]
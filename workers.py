@@ -0,0 +1,178 @@
+import time
+import threading
+from contextlib import closing
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from solver import iter_solutions, iter_solutions_threaded, solve_sequential, solve_threaded, _credit_prefixes
+from database import save_solutions, record_time, stored_solution_count, get_run_history
+from solution_cache import CacheWriter, open_cache
+from instrumentation import SearchStats
+
+PROGRESS_INTERVAL = 1 / 60  # seconds between progress signals, one per frame at 60 fps
+
+
+class WorkerSignals(QObject):
+    """Signals a background worker uses to talk to the UI thread."""
+    progress = pyqtSignal(int, int)  # solutions found, nodes explored
+    solutions = pyqtSignal(list)     # boards found since the previous emit
+    message = pyqtSignal(str)
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class SolverWorker(QRunnable):
+    """Run a solver on the thread pool, streaming boards back to the UI.
+
+    Both engines stream boards in batches as they are found, and the cancel
+    event is handed down to the search loops, so cancel() takes effect within
+    one node batch even while no solutions are turning up. Once a sequential
+    search has completed for a board size, later runs stream the solution
+    cache instead of searching, and only write rows the database is missing.
+    """
+
+    def __init__(self, method, n, batch_size=500):
+        super().__init__()
+        self.method = method
+        self.n = n
+        self.batch_size = batch_size
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def run(self):
+        try:
+            if self.method == "threaded":
+                self._run_threaded()
+            else:
+                self._run_streaming()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+    def _run_threaded(self):
+        start_time = time.time()
+        thread_stats = [SearchStats(self.n) for _ in range(self.n)]
+        with closing(iter_solutions_threaded(self.n, cancel=self._cancelled,
+                                             thread_stats=thread_stats)) as boards:
+            # Each thread starts below its first-row queen, so those n nodes are added up front
+            found = self._stream(boards, lambda: self.n + sum(stats.nodes for stats in thread_stats))
+        cancelled = self.is_cancelled()
+        if not cancelled:
+            stats = SearchStats(self.n)
+            _credit_prefixes(self.n, [(col,) for col in range(self.n)], stats)
+            for col, counters in enumerate(thread_stats):
+                stats.merge(counters, worker=f"thread-{col}")
+            record_time(self.method, time.time() - start_time, n=self.n, solutions=found,
+                        stats=stats.as_dict())
+        self.signals.finished.emit({"found": found, "cancelled": cancelled})
+
+    def _run_streaming(self):
+        cache = open_cache(self.n)
+        if cache is not None:
+            self._run_cached(cache)
+            return
+        start_time = time.time()
+        stats = SearchStats(self.n)
+        writer = CacheWriter(self.n) if self.n > 0 else None
+        try:
+            found = self._stream(iter_solutions(self.n, stats=stats, cancel=self._cancelled),
+                                 lambda: stats.nodes, writer)
+        except BaseException:
+            if writer is not None:
+                writer.discard()
+            raise
+        cancelled = self.is_cancelled()
+        if not cancelled:
+            record_time(self.method, time.time() - start_time, n=self.n, solutions=found,
+                        stats=stats.as_dict())
+        if writer is not None:
+            if cancelled:
+                writer.discard()
+            else:
+                writer.commit()
+        self.signals.finished.emit({"found": found, "cancelled": cancelled})
+
+    def _stream(self, boards, nodes, writer=None):
+        """Emit boards in batches until they run out or the worker is cancelled. Returns how many.
+
+        nodes() gives the number of nodes explored so far, for the progress signal.
+        """
+        batch = []
+        found = 0
+        last_emit = time.perf_counter()
+        for board in boards:
+            if self.is_cancelled():
+                break
+            batch.append(board)
+            found += 1
+            now = time.perf_counter()
+            if len(batch) >= self.batch_size or now - last_emit >= PROGRESS_INTERVAL:
+                self._emit_batch(batch, found, nodes(), writer=writer)
+                batch = []
+                last_emit = now
+        if batch:
+            self._emit_batch(batch, found, nodes(), writer=writer)
+        return found
+
+    def _run_cached(self, cache):
+        """Replay the cache; progress reports the recorded search's nodes in proportion to boards sent."""
+        persist = stored_solution_count(self.n) < len(cache)
+        history = get_run_history(self.method, n=self.n, limit=1)
+        searched = history[0]["stats"]["nodes"] if history and history[0]["stats"] else 0
+        found = 0
+        for start in range(0, len(cache), self.batch_size):
+            if self.is_cancelled():
+                break
+            batch = cache[start:start + self.batch_size]
+            found += len(batch)
+            self._emit_batch(batch, found, searched * found // len(cache), persist)
+        self.signals.finished.emit({"found": found, "cancelled": self.is_cancelled(), "cached": True})
+
+    def _emit_batch(self, batch, found, nodes, persist=True, writer=None):
+        if persist:
+            save_solutions(batch)
+        if writer is not None:
+            writer.add(batch)
+        self.signals.solutions.emit(batch)
+        self.signals.progress.emit(found, nodes)
+
+
+class CompareWorker(QRunnable):
+    """Time the sequential and threaded solvers over several runs off the UI thread."""
+
+    def __init__(self, n, runs=10):
+        super().__init__()
+        self.n = n
+        self.runs = runs
+        self.signals = WorkerSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def run(self):
+        try:
+            sequential_times = []
+            threaded_times = []
+            for i in range(self.runs):
+                if self._cancelled.is_set():
+                    break
+                self.signals.message.emit(f"Run {i+1}...\n")
+
+                start_seq = time.time()
+                solve_sequential(self.n)
+                sequential_times.append(time.time() - start_seq)
+
+                start_thr = time.time()
+                solve_threaded(self.n)
+                threaded_times.append(time.time() - start_thr)
+            self.signals.finished.emit({
+                "sequential": sequential_times,
+                "threaded": threaded_times,
+                "cancelled": self._cancelled.is_set(),
+            })
+        except Exception as e:
+            self.signals.error.emit(str(e))